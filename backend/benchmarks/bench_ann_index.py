@@ -0,0 +1,81 @@
+"""IVF index build time, query latency and recall@k on synthetic vectors.
+
+Vectors are drawn around random topic centres so that the clusters look
+roughly like real resume embeddings. Recall is measured against an exact
+brute-force scan.
+
+    cd backend && python benchmarks/bench_ann_index.py --n 1000000 --dim 768
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The index itself needs no database; keep the import from connecting to one
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from ann_index import build_index
+
+
+def synthetic_vectors(n, dim, topics=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((topics, dim)).astype(np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 100_000):
+        size = min(100_000, n - start)
+        noise = rng.standard_normal((size, dim)).astype(np.float32)
+        vectors[start:start + size] = centres[rng.integers(0, topics, size)] + 0.8 * noise
+    return vectors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[16, 32, 64, 96, 128])
+    args = parser.parse_args()
+
+    vectors = synthetic_vectors(args.n, args.dim)
+    ids = np.arange(1, args.n + 1, dtype=np.int64)
+    queries = synthetic_vectors(args.queries, args.dim, seed=1)
+
+    start = time.perf_counter()
+    index = build_index(ids, vectors)
+    print(f"{args.n} x {args.dim} vectors, {len(index._sizes)} lists, built in {time.perf_counter() - start:.1f}s\n")
+
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    exact = []
+    start = time.perf_counter()
+    for query in queries:
+        scores = normed @ (query / np.linalg.norm(query))
+        exact.append(set(ids[np.argpartition(-scores, args.k)[:args.k]].tolist()))
+    brute_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"brute force: {brute_ms:.1f} ms/query\n")
+    del normed
+
+    print(f"{'n_probe':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'recall@' + str(args.k):>10}")
+    for n_probe in args.n_probe:
+        index.n_probe = n_probe
+        latencies, hits = [], 0
+        for query, truth in zip(queries, exact):
+            start = time.perf_counter()
+            found, _ = index.search(query, args.k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len(truth & set(found.tolist()))
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{n_probe:>8} {p50:>9.2f} {p99:>9.2f} {hits / (args.k * len(queries)):>10.3f}")
+
+    start = time.perf_counter()
+    for doc_id in ids[:1000]:
+        index.remove(int(doc_id))
+    index.add(ids[:1000], vectors[:1000])
+    print(f"\n1000 deletes + 1000 inserts: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Throughput and latency of three ways to query the database from an endpoint.
+
+A small FastAPI app gets one endpoint per pattern, all running the same query
+that spends QUERY_MS waiting on the database: pg_sleep on PostgreSQL, and on
+SQLite a sleep_ms() function registered on every connection, which stands in
+for the server round trip (it waits without holding the GIL, like a socket
+read; a CPU-bound query would only measure how many cores there are):
+
+- async def with a sync Session: the query blocks the event loop
+  (what the async endpoints in main.py used to do);
+- def with a sync Session: FastAPI runs it in its threadpool (40 threads);
+- async def with an AsyncSession: the request waits without holding a thread.
+
+Each is driven in-process through httpx with CONCURRENCY requests in flight,
+while a task that sleeps LAG_EVERY seconds in a loop records how late it wakes
+up: the event loop lag every other request on the worker would see. Both
+engines come from database.py with a pool of CONCURRENCY connections, so the
+pool is never what limits them.
+
+    cd backend && python benchmarks/bench_async_db.py
+    DATABASE_URL=postgresql://... python benchmarks/bench_async_db.py   # a real server
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from database import async_database_url, make_async_engine, make_engine
+
+CONCURRENCY = 100
+REQUESTS = 500
+QUERY_MS = 20
+LAG_EVERY = 0.01
+
+
+def sleep_ms(ms):
+    time.sleep(ms / 1000)
+    return ms
+
+
+def slow_query(backend: str):
+    if backend == "postgresql":
+        return text("SELECT pg_sleep(:seconds)").bindparams(seconds=QUERY_MS / 1000)
+    return text("SELECT sleep_ms(:ms)").bindparams(ms=QUERY_MS)
+
+
+def register_sleep(sync_engine):
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep_ms", 1, sleep_ms)
+
+
+def build_app(engine, async_engine, query) -> FastAPI:
+    SyncSession = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession)
+
+    def get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/blocking")
+    async def blocking(db: Session = Depends(get_db)):
+        return db.execute(query).scalar()
+
+    @app.get("/threadpool")
+    def threadpool(db: Session = Depends(get_db)):
+        return db.execute(query).scalar()
+
+    @app.get("/async")
+    async def native(db: AsyncSession = Depends(get_async_db)):
+        return (await db.execute(query)).scalar()
+
+    return app
+
+
+async def load(app: FastAPI, path: str):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # Warm up the pool
+        limit = asyncio.Semaphore(CONCURRENCY)
+        latencies, lags = [], []
+        done = asyncio.Event()
+
+        async def one():
+            async with limit:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        async def watch_loop():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(LAG_EVERY)
+                lags.append(time.perf_counter() - start - LAG_EVERY)
+
+        watcher = asyncio.create_task(watch_loop())
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await watcher
+    return elapsed, latencies, lags
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return 1000 * values[min(len(values) - 1, int(p * len(values)))]
+
+
+def main():
+    url = os.environ["DATABASE_URL"]
+    engine = make_engine(url, pool_size=CONCURRENCY, max_overflow=0)
+    async_engine = make_async_engine(async_database_url(url), pool_size=CONCURRENCY, max_overflow=0)
+    backend = engine.dialect.name
+    if backend == "sqlite":
+        register_sleep(engine)
+        register_sleep(async_engine.sync_engine)
+    query = slow_query(backend)
+    app = build_app(engine, async_engine, query)
+
+    print(f"{backend}: {REQUESTS} requests, {CONCURRENCY} in flight, ~{QUERY_MS} ms query\n")
+    print(f"{'endpoint':<32} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'loop lag p95 ms':>16}")
+    labels = {
+        "/blocking": "async def + sync Session",
+        "/threadpool": "def + sync Session (threadpool)",
+        "/async": "async def + AsyncSession",
+    }
+
+    async def run():
+        results = {path: await load(app, path) for path in labels}
+        await async_engine.dispose()
+        return results
+
+    for path, (elapsed, latencies, lags) in asyncio.run(run()).items():
+        print(f"{labels[path]:<32} {REQUESTS / elapsed:>7.0f} {percentile(latencies, 0.5):>8.1f} "
+              f"{percentile(latencies, 0.95):>8.1f} {percentile(lags, 0.95):>16.1f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
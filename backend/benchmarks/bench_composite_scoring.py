@@ -0,0 +1,57 @@
+"""Composite scoring time for one job against large applicant pools.
+
+Applicant features are synthesised in the same format upload_resume stores
+them (comma-separated skills, "N years of experience", "<keyword> degree
+found", packed TF-IDF terms), so the timing covers parsing the stored columns
+as well as the vectorized scoring.
+
+    cd backend && python benchmarks/bench_composite_scoring.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from scoring import score_applicants
+from tfidf_index import CorpusTfidf, encode_terms, term_frequencies
+from utils import EDUCATION_KEYWORDS, extract_job_description_features, get_skill_matcher
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "samples")
+POOL_SIZES = [1_000, 10_000, 50_000, 100_000]
+
+
+def main():
+    rng = random.Random(0)
+    with open(os.path.join(SAMPLES_DIR, "job_posting_software_engineer.txt"), encoding="utf-8") as f:
+        job_text = f.read()
+    resume_texts = []
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        if name.startswith("resume"):
+            with open(os.path.join(SAMPLES_DIR, name), encoding="utf-8") as f:
+                resume_texts.append(f.read())
+
+    job_features = extract_job_description_features(job_text)
+    job_terms = encode_terms(term_frequencies([job_text]))
+    resume_terms = [encode_terms(row) for row in term_frequencies(resume_texts)]
+    corpus = CorpusTfidf()
+    corpus.add_documents(term_frequencies([job_text] + resume_texts))
+    taxonomy = get_skill_matcher().skills
+
+    print(f"{'applicants':>10} {'seconds':>9}")
+    for size in POOL_SIZES:
+        skills = [", ".join(rng.sample(taxonomy, rng.randint(3, 25))) for _ in range(size)]
+        experience = [f"{rng.randint(0, 15)} years of experience" if rng.random() < 0.8 else "Experience not specified"
+                      for _ in range(size)]
+        education = [f"{rng.choice(EDUCATION_KEYWORDS)} degree found" for _ in range(size)]
+        terms = [resume_terms[i % len(resume_terms)] for i in range(size)]
+
+        start = time.perf_counter()
+        score_applicants(job_features, job_terms, skills, experience, education, terms, corpus)
+        print(f"{size:>10} {time.perf_counter() - start:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Connection-acquire latency under load for a few pool sizes.
+
+THREADS threads each run ITERATIONS short transactions against a throwaway
+SQLite database, holding the connection for HOLD_MS (standing in for query
+and network time). For each pool size the engine comes from
+database.make_engine, and the numbers are the ones GET /db-pool reports:
+how long checkouts waited for a free connection, and how many timed out.
+
+    cd backend && python benchmarks/bench_db_pool.py
+    DATABASE_URL=postgresql://... python benchmarks/bench_db_pool.py   # a real server
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from database import make_engine, pool_status
+
+THREADS = 32
+ITERATIONS = 50
+HOLD_MS = 5
+POOL_SIZES = [4, 16, 32]
+
+
+def worker(Session, barrier):
+    barrier.wait()
+    for _ in range(ITERATIONS):
+        db = Session()
+        try:
+            db.execute(text("SELECT 1"))
+            time.sleep(HOLD_MS / 1000)
+        finally:
+            db.close()
+
+
+def main():
+    url = os.environ["DATABASE_URL"]
+    print(f"{THREADS} threads x {ITERATIONS} transactions holding a connection {HOLD_MS} ms\n")
+    print(f"{'pool':>5} {'tx/s':>8} {'wait p50 ms':>12} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'timeouts':>9} {'connects':>9}")
+    for size in POOL_SIZES:
+        engine = make_engine(url, pool_size=size, max_overflow=0, pool_timeout=10)
+        Session = sessionmaker(bind=engine)
+        barrier = threading.Barrier(THREADS + 1)
+        threads = [threading.Thread(target=worker, args=(Session, barrier)) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        status = pool_status(engine)
+        wait = status["wait_ms"]
+        print(f"{size:>5} {THREADS * ITERATIONS / elapsed:>8.0f} {wait['p50']:>12.2f} {wait['p95']:>8.2f} "
+              f"{wait['p99']:>8.2f} {wait['max']:>8.2f} {status['timeouts']:>9} {status['connects']:>9}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
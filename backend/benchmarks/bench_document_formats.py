@@ -0,0 +1,128 @@
+"""Text extraction throughput per document format.
+
+Builds a corpus of large PDF, DOCX and TXT documents from the sample resumes
+(PAGES pages each) in a temp directory, then times format detection plus
+extract_text for each format, and how soon iter_text yields its first piece.
+
+    cd backend && python benchmarks/bench_document_formats.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import docx
+
+from documents import detect_format, extract_text, iter_text
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "samples")
+DOCS_PER_FORMAT = 5
+PAGES = 40
+LINES_PER_PAGE = 45
+
+
+def sample_lines():
+    lines = []
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        with open(os.path.join(SAMPLES_DIR, name), encoding="utf-8") as f:
+            lines.extend(line.strip() for line in f if line.strip())
+    return lines
+
+
+def pages_of(lines):
+    for page in range(PAGES):
+        start = page * LINES_PER_PAGE
+        yield [lines[(start + i) % len(lines)] for i in range(LINES_PER_PAGE)]
+
+
+def write_pdf(path, lines):
+    """Minimal uncompressed PDF, one text stream per page"""
+    objects = []
+    page_ids = []
+    font_id = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page_lines in pages_of(lines):
+        text = [b"BT /F1 9 Tf 40 800 Td 11 TL"]
+        for line in page_lines:
+            escaped = line.encode("latin-1", "replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+            text.append(b"(" + escaped + b") '")
+        text.append(b"ET")
+        stream = b"\n".join(text)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects) + 2
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (content_id, font_id))
+        page_ids.append(len(objects) + 2)
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)] + objects
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path, lines):
+    document = docx.Document()
+    for page_lines in pages_of(lines):
+        for line in page_lines:
+            document.add_paragraph(line)
+        document.add_page_break()
+    document.save(path)
+
+
+def write_txt(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        for page_lines in pages_of(lines):
+            f.write("\n".join(page_lines) + "\n\f")
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt}
+
+
+def main():
+    lines = sample_lines()
+    with tempfile.TemporaryDirectory() as corpus:
+        paths = {}
+        for name, writer in WRITERS.items():
+            paths[name] = []
+            for i in range(DOCS_PER_FORMAT):
+                # No extension: the format has to be sniffed from the content
+                path = os.path.join(corpus, f"{name}_{i}")
+                writer(path, lines[i * 7:] + lines[:i * 7])
+                paths[name].append(path)
+
+        print(f"{DOCS_PER_FORMAT} documents per format, {PAGES} pages each\n")
+        print(f"{'format':>6} {'file MB':>8} {'text MB':>8} {'seconds':>8} {'text MB/s':>10} {'first piece ms':>15}")
+        for name, files in paths.items():
+            assert all(detect_format(path).name == name for path in files)
+            file_mb = sum(os.path.getsize(path) for path in files) / 1e6
+
+            start = time.perf_counter()
+            text_mb = sum(len(extract_text(path)) for path in files) / 1e6
+            elapsed = time.perf_counter() - start
+
+            first = []
+            for path in files:
+                start = time.perf_counter()
+                pieces = iter_text(path)
+                next(pieces)
+                first.append(time.perf_counter() - start)
+                pieces.close()
+            print(f"{name:>6} {file_mb:>8.2f} {text_mb:>8.2f} {elapsed:>8.2f} {text_mb / elapsed:>10.2f} "
+                  f"{1000 * sum(first) / len(first):>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Query plans and latency of the hot list/lookup queries, without and with the
+indexes from migration a6d3f8b2c015.
+
+Builds a synthetic SQLite database (RECRUITERS recruiters with JOBS_PER_RECRUITER
+postings each, APPLICANTS applicants with one resume, APPLICATIONS_PER_APPLICANT
+applications and SESSIONS_PER_USER sessions each), first without the new
+indexes and unique constraint, calls each endpoint directly, then creates
+them, runs ANALYZE and calls the endpoints again. For every endpoint it
+prints the median latency and the plan of the query it sent.
+
+    cd backend && python benchmarks/bench_hot_indexes.py
+"""
+import asyncio
+import inspect
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'bench.db')}"
+os.environ.setdefault("INGEST_IN_PROCESS", "false")
+os.chdir(_tmp)
+
+from fastapi import HTTPException, Response
+from sqlalchemy import Index, UniqueConstraint, event, insert
+
+import main as api
+from database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from models import Application, JobDescription, Resume, Session as SessionModel, User
+from pagination import Page
+
+RECRUITERS = 1000
+JOBS_PER_RECRUITER = 5
+APPLICANTS = 50000
+APPLICATIONS_PER_APPLICANT = 5
+SESSIONS_PER_USER = 2
+REPEAT = 5
+
+NEW_INDEXES = {
+    Application.__table__: ["ix_applications_job_id_id", "uq_applications_user_id_job_id"],
+    JobDescription.__table__: ["ix_job_descriptions_user_id_id"],
+    Resume.__table__: ["ix_resumes_user_id_id"],
+    SessionModel.__table__: ["ix_sessions_user_id_is_active_expires_at"],
+}
+_statements = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _record(conn, cursor, statement, parameters, context, executemany):
+    _statements.append((statement, parameters))
+
+
+def strip_new_indexes():
+    """Recreate the tables as they were before the migration"""
+    removed = []
+    for table, names in NEW_INDEXES.items():
+        table.drop(engine)
+        for index in [index for index in table.indexes if index.name in names]:
+            table.indexes.discard(index)
+            removed.append(index)
+        for constraint in [c for c in table.constraints if isinstance(c, UniqueConstraint) and c.name in names]:
+            table.constraints.discard(constraint)
+            removed.append(constraint)
+        table.create(engine)
+    return removed
+
+
+def add_indexes(removed):
+    for item in removed:
+        if isinstance(item, Index):
+            item.create(engine)
+        else:
+            columns = ", ".join(column.name for column in item.columns)
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f"CREATE UNIQUE INDEX {item.name} ON {item.table.name} ({columns})")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+
+def seed():
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "hashed_password": "x",
+             "role": "recruiter" if i <= RECRUITERS else "applicant"}
+            for i in range(1, RECRUITERS + APPLICANTS + 1)
+        ])
+        jobs = RECRUITERS * JOBS_PER_RECRUITER
+        conn.execute(insert(JobDescription), [
+            {"id": j, "filename": f"job_{j}.txt", "user_id": (j - 1) // JOBS_PER_RECRUITER + 1,
+             "features": {"skills": ["Python"]}, "upload_date": now}
+            for j in range(1, jobs + 1)
+        ])
+        conn.execute(insert(Resume), [
+            {"id": r, "filename": f"resume_{r}.txt", "user_id": RECRUITERS + r, "skills": "Python, Docker"}
+            for r in range(1, APPLICANTS + 1)
+        ])
+        applications = []
+        for r in range(1, APPLICANTS + 1):
+            for job_id in rng.sample(range(1, jobs + 1), APPLICATIONS_PER_APPLICANT):
+                applications.append({"user_id": RECRUITERS + r, "job_id": job_id, "resume_id": r,
+                                     "status": "pending", "applied_date": now})
+        rng.shuffle(applications)
+        conn.execute(insert(Application), applications)
+        conn.execute(insert(SessionModel), [
+            {"user_id": user_id, "token": f"t{user_id}_{k}", "created_at": now, "is_active": k == 0,
+             "expires_at": now + timedelta(days=1 if k == 0 else -1)}
+            for user_id in range(1, RECRUITERS + APPLICANTS + 1) for k in range(SESSIONS_PER_USER)
+        ])
+
+
+def endpoints(db):
+    recruiter = db.get(User, RECRUITERS // 2)
+    applicant = db.get(User, RECRUITERS + APPLICANTS // 2)
+    job_id = recruiter.id * JOBS_PER_RECRUITER
+    applied = db.query(Application.job_id).filter(Application.user_id == applicant.id).first().job_id
+    resume_id = applicant.id - RECRUITERS
+    return {
+        "GET /applications": lambda: with_async_db(api.get_user_applications, Response(), Page(), current_user=applicant),
+        "GET /recruiter/applications": lambda: with_async_db(
+            api.get_recruiter_applications, Response(), Page(), current_user=recruiter),
+        "GET /recruiter/applications/{id}": lambda: with_async_db(
+            api.get_job_applications, job_id, Response(), Page(), current_user=recruiter),
+        "GET /resumes/me": lambda: with_async_db(api.get_user_resumes, Response(), Page(), current_user=applicant),
+        "GET /job-descriptions/": lambda: with_async_db(
+            api.get_job_descriptions, Response(), Page(), current_user=recruiter),
+        "GET /sessions": lambda: with_async_db(api.get_active_sessions, Response(), Page(), current_user=applicant),
+        "POST /applications (dup check)": lambda: with_async_db(
+            api.create_application, applied, resume_id, current_user=applicant),
+        "GET /rank-candidates/ (skills)": lambda: api.rank_candidates(
+            job_id, mode="skills", weights=None, db=db, current_user=recruiter),
+    }
+
+
+async def with_async_db(endpoint, *args, **kwargs):
+    async with AsyncSessionLocal() as db:
+        return await endpoint(*args, db=db, **kwargs)
+
+
+def call(run):
+    try:
+        result = run()
+        if inspect.iscoroutine(result):
+            asyncio.run(result)
+    except HTTPException:
+        pass
+
+
+def measure(label):
+    db = SessionLocal()
+    results = {}
+    for name, run in endpoints(db).items():
+        call(run)  # Warm up
+        timings = []
+        for _ in range(REPEAT):
+            _statements.clear()
+            start = time.perf_counter()
+            call(run)
+            timings.append(time.perf_counter() - start)
+        # The query that touches the hot table: the last SELECT the endpoint sent
+        statement, parameters = [s for s in _statements if s[0].lstrip().upper().startswith("SELECT")][-1]
+        with engine.connect() as conn:
+            plan = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+        results[name] = (statistics.median(timings), plan)
+        db.rollback()
+    db.close()
+    print(f"\n== {label}")
+    for name, (seconds, plan) in results.items():
+        print(f"{name:<34} {1000 * seconds:>8.2f} ms   {' | '.join(plan)}")
+    return results
+
+
+def main():
+    removed = strip_new_indexes()
+    start = time.perf_counter()
+    seed()
+    print(f"{RECRUITERS + APPLICANTS} users, {RECRUITERS * JOBS_PER_RECRUITER} jobs, {APPLICANTS} resumes, "
+          f"{APPLICANTS * APPLICATIONS_PER_APPLICANT} applications, "
+          f"{(RECRUITERS + APPLICANTS) * SESSIONS_PER_USER} sessions (seeded in {time.perf_counter() - start:.0f}s)")
+    before = measure("without the new indexes")
+    add_indexes(removed)
+    after = measure("with the new indexes")
+
+    print(f"\n{'endpoint':<34} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in before:
+        b, a = before[name][0], after[name][0]
+        print(f"{name:<34} {1000 * b:>10.2f} {1000 * a:>10.2f} {b / a:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
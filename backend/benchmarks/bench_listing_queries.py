@@ -0,0 +1,126 @@
+"""SQL statements issued by the application listing endpoints per result size.
+
+Seeds a throwaway SQLite database with one recruiter and N job postings. One
+applicant applies to all N; N - 1 more applicants apply to the first posting.
+That makes N rows each for /applications and /recruiter/applications/{job_id},
+and 2N - 1 for /recruiter/applications. The script calls the endpoints
+directly and counts the statements sent to the database. The count must be
+the same for every N; the script exits non-zero otherwise. The listings are
+paginated, so every N is small enough for all rows to fit on one page of
+PAGE_SIZE_MAX; a listing that comes back short also fails the run.
+tests/test_listing_queries.py asserts the same in the test suite; this
+script adds timings.
+
+    cd backend && python benchmarks/bench_listing_queries.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'bench.db')}"
+os.environ.setdefault("INGEST_IN_PROCESS", "false")
+os.chdir(_tmp)
+
+from fastapi import Response
+from sqlalchemy import event
+
+import main as api
+from database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from models import Application, JobDescription, Resume, User
+from pagination import PAGE_SIZE_MAX, Page
+
+SIZES = [10, 100, 250]  # 2N - 1 <= PAGE_SIZE_MAX
+RESUME_TEXT = "Python developer with Docker and AWS. " * 200
+_statements = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    _statements.append(statement)
+
+
+async def with_async_db(endpoint, *args, **kwargs):
+    async with AsyncSessionLocal() as db:
+        return await endpoint(*args, db=db, **kwargs)
+
+
+def seed(db, n: int):
+    recruiter = User(email=f"recruiter{n}@example.com", hashed_password="x", role="recruiter")
+    db.add(recruiter)
+    db.flush()
+    jobs = [JobDescription(filename=f"job_{n}_{j}.txt", content="Python", features={"skills": ["Python"]},
+                           user_id=recruiter.id) for j in range(n)]
+    db.add_all(jobs)
+    db.flush()
+    applicants = []
+    for i in range(n):
+        applicant = User(email=f"applicant{n}_{i}@example.com", hashed_password="x", role="applicant")
+        db.add(applicant)
+        db.flush()
+        resume = Resume(filename=f"resume_{i}.txt", content=RESUME_TEXT, skills="Python, Docker, AWS",
+                        experience="3 years of experience", education="Bachelor degree found", user_id=applicant.id)
+        db.add(resume)
+        db.flush()
+        applicants.append((applicant, resume))
+    # The first applicant applies everywhere, the others to the first posting
+    applicant, resume = applicants[0]
+    db.add_all(Application(user_id=applicant.id, job_id=job.id, resume_id=resume.id) for job in jobs)
+    db.add_all(Application(user_id=other.id, job_id=jobs[0].id, resume_id=other_resume.id)
+               for other, other_resume in applicants[1:])
+    db.commit()
+    return recruiter, jobs[0], applicant
+
+
+def measure(call):
+    _statements.clear()
+    start = time.perf_counter()
+    result = asyncio.run(call())
+    return len(_statements), time.perf_counter() - start, len(result)
+
+
+def main():
+    if 2 * max(SIZES) - 1 > PAGE_SIZE_MAX:
+        sys.exit(f"SIZES must keep 2N - 1 within PAGE_SIZE_MAX ({PAGE_SIZE_MAX})")
+    counts, short = {}, []
+    print(f"{'endpoint':<32} {'rows':>6} {'queries':>8} {'ms':>8}")
+    for n in SIZES:
+        db = SessionLocal()
+        recruiter, job, applicant = seed(db, n)
+        endpoints = {
+            "/recruiter/applications": (2 * n - 1, lambda: with_async_db(
+                api.get_recruiter_applications, Response(), Page(PAGE_SIZE_MAX), current_user=recruiter)),
+            "/recruiter/applications/{job_id}": (n, lambda: with_async_db(
+                api.get_job_applications, job.id, Response(), Page(PAGE_SIZE_MAX), current_user=recruiter)),
+            "/applications": (n, lambda: with_async_db(
+                api.get_user_applications, Response(), Page(PAGE_SIZE_MAX), current_user=applicant)),
+        }
+        for name, (expected, call) in endpoints.items():
+            queries, seconds, rows = measure(call)
+            counts.setdefault(name, set()).add(queries)
+            if rows != expected:
+                short.append(f"{name} returned {rows} of {expected} rows")
+            print(f"{name:<32} {rows:>6} {queries:>8} {1000 * seconds:>8.1f}")
+
+        _statements.clear()
+        ranked = api.rank_candidates(job.id, mode="skills", weights=None, db=db, current_user=recruiter)
+        counts.setdefault("/rank-candidates/", set()).add(len(_statements))
+        print(f"{'/rank-candidates/ (skills)':<32} {len(ranked['ranked_candidates']):>6} {len(_statements):>8}")
+        db.close()
+
+    varying = [name for name, seen in counts.items() if len(seen) > 1]
+    if short:
+        print("\n" + "\n".join(short))
+        sys.exit(1)
+    if varying:
+        print(f"\nquery count depends on result size: {', '.join(varying)}")
+        sys.exit(1)
+    print("\nquery count is independent of result size")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cost of one page of /jobs/available as the table grows.
+
+Seeds a throwaway SQLite database with N job postings (bulk inserts) and
+times the first page, a page deep into the list (following cursors), and
+the whole list as a single unpaginated query for comparison.
+
+    cd backend && python benchmarks/bench_pagination.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'bench.db')}"
+os.environ.setdefault("INGEST_IN_PROCESS", "false")
+os.chdir(_tmp)
+
+from fastapi import Response
+
+import main as api
+from database import AsyncSessionLocal, SessionLocal
+from models import JobDescription, User
+from pagination import NEXT_CURSOR_HEADER, Page, decode_cursor
+
+SIZES = [1000, 10000, 100000]
+PAGE_SIZE = 100
+DEEP_PAGE = 5
+JOB = {"content": "Python developer. " * 100, "features": {"skills": ["Python", "Docker"]}}
+
+
+async def available_jobs(response, page, user):
+    async with AsyncSessionLocal() as db:
+        return await api.get_available_jobs(response, page, current_user=user, db=db)
+
+
+def page(user, after=None):
+    response = Response()
+    start = time.perf_counter()
+    rows = asyncio.run(available_jobs(response, Page(PAGE_SIZE, after), user))
+    elapsed = time.perf_counter() - start
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return rows, elapsed, decode_cursor(cursor) if cursor else None
+
+
+def main():
+    db = SessionLocal()
+    user = User(email="applicant@example.com", hashed_password="x", role="applicant")
+    db.add(user)
+    db.commit()
+    seeded = 0
+    print(f"{'jobs':>7} {'first page ms':>14} {'page ' + str(DEEP_PAGE) + ' ms':>10} {'everything ms':>14}")
+    for n in SIZES:
+        db.bulk_insert_mappings(JobDescription, [
+            dict(JOB, filename=f"job_{i}.txt", user_id=user.id) for i in range(seeded, n)
+        ])
+        db.commit()
+        seeded = n
+
+        rows, first, after = page(user)
+        assert len(rows) == PAGE_SIZE
+        for _ in range(DEEP_PAGE - 1):
+            rows, deep, after = page(user, after)
+
+        start = time.perf_counter()
+        everything = db.query(JobDescription.id, JobDescription.filename, JobDescription.upload_date,
+                              JobDescription.features).all()
+        whole = time.perf_counter() - start
+        assert len(everything) == n
+        print(f"{n:>7} {1000 * first:>14.1f} {1000 * deep:>10.1f} {1000 * whole:>14.1f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
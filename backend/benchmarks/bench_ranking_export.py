@@ -0,0 +1,111 @@
+"""Peak memory of ranking a large applicant pool: JSON response vs streamed export.
+
+Seeds a throwaway SQLite database with one job and N applications (stored
+skills, experience, education and TF-IDF terms, bulk inserted), then ranks
+them in composite mode twice while tracing Python allocations:
+
+- GET /rank-candidates/ builds every candidate dict and the JSON body;
+- the NDJSON export is consumed line by line and never held whole.
+
+It checks that both produce the same ranking.
+
+    cd backend && python benchmarks/bench_ranking_export.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'bench.db')}"
+os.environ.setdefault("INGEST_IN_PROCESS", "false")
+os.chdir(_tmp)
+
+from fastapi.encoders import jsonable_encoder
+
+import main as api
+from database import SessionLocal
+from models import Application, JobDescription, Resume, User
+from ranking import export_ranking
+from tfidf_index import encode_terms, term_frequencies
+
+SIZES = [10000, 50000]
+SKILLS = ["Python", "Docker", "AWS", "React", "SQL", "Kubernetes", "Java", "Go"]
+
+
+def seed(db, n: int, start: int):
+    users = [dict(email=f"applicant{i}@example.com", hashed_password="x", role="applicant")
+             for i in range(start, n)]
+    db.bulk_insert_mappings(User, users)
+    user_ids = [row.id for row in db.query(User.id).filter(User.role == "applicant").order_by(User.id)][start:n]
+    resumes = []
+    for i, user_id in zip(range(start, n), user_ids):
+        skills = [skill for bit, skill in enumerate(SKILLS) if (i * 2654435761) >> bit & 1]
+        text = " ".join(skills) + f" developer number {i % 97} with {i % 12} years"
+        resumes.append(dict(
+            filename=f"resume_{i}.txt", user_id=user_id, skills=", ".join(skills),
+            experience=f"{i % 12} years of experience", education="Bachelor degree found",
+            tfidf_terms=encode_terms(term_frequencies([text]))
+        ))
+    db.bulk_insert_mappings(Resume, resumes)
+    resume_ids = [row.id for row in db.query(Resume.id).order_by(Resume.id)][start:n]
+    job_id = db.query(JobDescription.id).scalar()
+    db.bulk_insert_mappings(Application, [
+        dict(user_id=user_id, job_id=job_id, resume_id=resume_id, status="pending")
+        for user_id, resume_id in zip(user_ids, resume_ids)
+    ])
+    db.commit()
+
+
+def traced(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    db = SessionLocal()
+    recruiter = User(email="recruiter@example.com", hashed_password="x", role="recruiter")
+    db.add(recruiter)
+    db.flush()
+    job_text = "Python Docker AWS SQL developer"
+    job = JobDescription(filename="job.txt", content=job_text, user_id=recruiter.id,
+                         features={"skills": ["Python", "Docker", "AWS", "SQL"], "min_experience_years": 5},
+                         tfidf_terms=encode_terms(term_frequencies([job_text])))
+    db.add(job)
+    db.commit()
+
+    seeded = 0
+    print(f"{'applicants':>10} {'json MB':>8} {'json s':>7} {'export MB':>10} {'export s':>9}")
+    for n in SIZES:
+        seed(db, n, seeded)
+        seeded = n
+
+        def as_json():
+            ranked = api.rank_candidates(job.id, mode="composite", weights=None, db=db, current_user=recruiter)
+            return json.loads(json.dumps(jsonable_encoder(ranked)))["ranked_candidates"]
+
+        def exported():
+            order, lines = [], 0
+            for piece in export_ranking(db, job.id, "composite", "ndjson"):
+                for line in piece.splitlines():
+                    order.append(json.loads(line)["application_id"])
+                    lines += 1
+            return order
+
+        full, json_seconds, json_peak = traced(as_json)
+        order, export_seconds, export_peak = traced(exported)
+        assert order == [candidate["application_id"] for candidate in full], "rankings differ"
+        print(f"{n:>10} {json_peak:>8.1f} {json_seconds:>7.2f} {export_peak:>10.1f} {export_seconds:>9.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Embedding throughput (resumes/sec) for batch sizes 1 to 64 on CPU.
+
+The sample resumes are repeated to build the corpus. Use EMBEDDING_MODEL_NAME
+to benchmark another model and --threads to pin torch's thread count.
+
+    cd backend && python benchmarks/bench_semantic_batching.py --docs 256 --threads 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_registry import EMBEDDING_MODEL_NAME, registry
+from semantic import cosine_scores, embed_texts
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "samples")
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64]
+
+
+def load_corpus(n_docs):
+    resumes, jobs = [], []
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        with open(os.path.join(SAMPLES_DIR, name), encoding="utf-8") as f:
+            (resumes if name.startswith("resume") else jobs).append(f.read())
+    return jobs[0], [resumes[i % len(resumes)] for i in range(n_docs)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=128)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    job, resumes = load_corpus(args.docs)
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+    stats = registry.warmup(["embedding"])["embedding"]
+    print(f"model {EMBEDDING_MODEL_NAME}: loaded in {stats['load_seconds']}s, +{stats['rss_delta_mb']} MB RSS")
+    embed_texts(resumes[:2], batch_size=2)  # warm kernels
+
+    print(f"{args.docs} resumes, threads={args.threads or 'default'}\n")
+    print(f"{'batch':>6} {'seconds':>9} {'resumes/s':>10}")
+    for batch_size in BATCH_SIZES:
+        start = time.perf_counter()
+        vectors = embed_texts([job] + resumes, batch_size=batch_size)
+        cosine_scores(vectors[0], vectors[1:])
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>6} {elapsed:>9.2f} {args.docs / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
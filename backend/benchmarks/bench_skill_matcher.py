@@ -0,0 +1,67 @@
+"""Skill extraction time versus taxonomy size.
+
+Compares the compiled SkillMatcher with the old one-substring-test-per-skill
+loop on the sample resumes, for synthetic taxonomies of growing size.
+
+    cd backend && python benchmarks/bench_skill_matcher.py
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher, load_taxonomy
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "samples")
+SIZES = [100, 1_000, 10_000, 50_000]
+REPEAT = 20
+
+
+def synthetic_taxonomy(size, seed=0):
+    """Real taxonomy padded with random skill-like names and aliases"""
+    rng = random.Random(seed)
+    taxonomy = load_taxonomy(os.path.join(BACKEND_DIR, "data", "skills.json"))
+    while len(taxonomy) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+                 for _ in range(rng.randint(1, 3))]
+        name = " ".join(words).title()
+        taxonomy.append((name, [words[0][:3] + str(len(taxonomy))]))
+    return taxonomy[:size]
+
+
+def naive_extract(skills, text):
+    text_lower = text.lower()
+    return [skill for skill in skills if skill.lower() in text_lower]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    texts = []
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        with open(os.path.join(SAMPLES_DIR, name), encoding="utf-8") as f:
+            texts.append(f.read())
+    corpus = "\n".join(texts)
+    print(f"corpus: {len(texts)} documents, {len(corpus)} chars, {REPEAT} runs each\n")
+    print(f"{'skills':>8} {'build (ms)':>11} {'matcher (ms)':>13} {'naive (ms)':>11}")
+    for size in SIZES:
+        taxonomy = synthetic_taxonomy(size)
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build = time.perf_counter() - start
+        compiled = timed(matcher.find, corpus)
+        naive = timed(naive_extract, [name for name, _ in taxonomy], corpus)
+        print(f"{size:>8} {build * 1000:>11.1f} {compiled * 1000:>13.2f} {naive * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Content-addressed storage for uploaded files.
+
+Uploads are stored once per distinct content under BLOB_STORAGE_DIR, at a
+path derived from their SHA-256 (ab/cd/abcd...). The blobs table counts the
+references to each file: one per queued upload and, once processed, one per
+Resume / JobDescription row with that content_hash. Releasing the last
+reference deletes the file.
+
+The directory is deliberately outside uploads/, which is served as static
+files.
+"""
+import hashlib
+import os
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from models import JobDescription, Resume, StoredBlob
+from upload_stream import UPLOAD_CHUNK_SIZE, stream_upload
+
+load_dotenv()
+
+BLOB_STORAGE_DIR = os.getenv("BLOB_STORAGE_DIR", "blobs")
+
+
+def blob_path(content_hash: str) -> str:
+    return os.path.join(BLOB_STORAGE_DIR, content_hash[:2], content_hash[2:4], content_hash)
+
+
+def acquire(db: Session, content_hash: str, size: int):
+    """Add one reference to a blob, creating its row if needed"""
+    for _ in range(2):
+        updated = db.query(StoredBlob).filter(StoredBlob.sha256 == content_hash).update(
+            {StoredBlob.ref_count: StoredBlob.ref_count + 1}, synchronize_session=False
+        )
+        if updated:
+            db.commit()
+            return
+        db.add(StoredBlob(sha256=content_hash, size=size, ref_count=1, created_at=datetime.utcnow()))
+        try:
+            db.commit()
+            return
+        except IntegrityError:
+            # Someone else created it first; bump their row instead
+            db.rollback()
+    raise RuntimeError(f"Could not reference blob {content_hash}")
+
+
+def release(db: Session, content_hash: str):
+    """Drop one reference; the last one deletes the row and the file"""
+    if not content_hash:
+        return
+    db.query(StoredBlob).filter(StoredBlob.sha256 == content_hash).update(
+        {StoredBlob.ref_count: StoredBlob.ref_count - 1}, synchronize_session=False
+    )
+    removed = db.query(StoredBlob).filter(
+        StoredBlob.sha256 == content_hash,
+        StoredBlob.ref_count <= 0
+    ).delete(synchronize_session=False)
+    if removed:
+        try:
+            os.remove(blob_path(content_hash))
+        except FileNotFoundError:
+            pass
+    db.commit()
+
+
+def acquire_many(db: Session, sizes: Dict[str, int], counts: Dict[str, int]):
+    """acquire for a batch of files inside the caller's transaction.
+
+    The caller commits; an IntegrityError on commit means another writer
+    created one of the rows first and the batch should be retried.
+    """
+    for content_hash, n in counts.items():
+        updated = db.query(StoredBlob).filter(StoredBlob.sha256 == content_hash).update(
+            {StoredBlob.ref_count: StoredBlob.ref_count + n}, synchronize_session=False
+        )
+        if not updated:
+            db.add(StoredBlob(sha256=content_hash, size=sizes[content_hash], ref_count=n, created_at=datetime.utcnow()))
+    db.flush()
+
+
+def incoming_path() -> str:
+    incoming = os.path.join(BLOB_STORAGE_DIR, "incoming")
+    os.makedirs(incoming, exist_ok=True)
+    return os.path.join(incoming, uuid.uuid4().hex)
+
+
+def copy_to_incoming(source: BinaryIO, limit: Optional[int] = None) -> Tuple[str, int, str]:
+    """Copy a file object into the incoming area, hashing it on the way.
+
+    Returns (partial path, size, sha256); raises ValueError past limit bytes.
+    """
+    partial = incoming_path()
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(partial, "wb") as buffer:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if limit is not None and size > limit:
+                    raise ValueError(f"File is larger than {limit / (1024 * 1024):g} MB")
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        os.remove(partial)
+        raise
+    return partial, size, digest.hexdigest()
+
+
+def place(partial: str, content_hash: str) -> str:
+    """Move a file from the incoming area to its content address"""
+    path = blob_path(content_hash)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(partial, path)
+    return path
+
+
+def _commit_upload(db: Session, partial: str, content_hash: str, size: int) -> str:
+    # Take the reference before the file is moved into place so a concurrent
+    # release of the same content cannot delete it underneath us
+    acquire(db, content_hash, size)
+    return place(partial, content_hash)
+
+
+async def store_upload(db: Session, file: UploadFile) -> Tuple[str, int, str]:
+    """Stream an upload into the store; returns (sha256, size, path)"""
+    partial = incoming_path()
+    size, content_hash = await stream_upload(file, partial)
+    try:
+        path = await run_in_threadpool(_commit_upload, db, partial, content_hash, size)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return content_hash, size, path
+
+
+def remove_legacy_upload(db: Session, filename: str):
+    """Delete uploads/<filename> for rows stored before content addressing,
+    unless another such row still uses the same name"""
+    still_used = db.query(Resume.id).filter(Resume.filename == filename, Resume.content_hash.is_(None)).first() \
+        or db.query(JobDescription.id).filter(JobDescription.filename == filename, JobDescription.content_hash.is_(None)).first()
+    file_path = os.path.join("uploads", filename)
+    if not still_used and os.path.exists(file_path):
+        try:
+            os.remove(file_path)
+        except Exception as e:
+            print(f"Error deleting file: {e}")
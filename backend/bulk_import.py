@@ -0,0 +1,382 @@
+"""Bulk import of documents from a directory or a zip archive.
+
+    python bulk_import.py ../samples --kind resume
+    python bulk_import.py resumes.zip --user-id 3
+    python bulk_import.py --resume 12
+
+Each file is copied into the blob store (hashed on the way) and looked up
+in the parse cache. The files not in the cache are parsed across all cores
+in a process pool, with the parser limits from documents.py. Rows are
+inserted BULK_IMPORT_BATCH_SIZE at a time. Each batch commits in one
+transaction with the run's checkpoint (import_runs.position), so an
+interrupted import picks up after the last committed batch
+(--resume, or POST /bulk-imports/{id}/resume).
+
+Files that fail to parse are counted and listed in import_runs.errors; they
+do not stop the import. After each batch the new rows are counted into the
+corpus IDF and, with SEMANTIC_FEATURES_ENABLED, queued for embedding on a
+background thread; /source-candidates/ picks up each resume once its vector
+is written (ann_index syncs by embedded_at). A command-line import waits for
+that queue before it exits. A worker crash loses every task in flight, so those
+files are parsed again, and a file only fails for crashing the worker once
+it has crashed it on its own.
+"""
+import argparse
+import os
+import shutil
+import threading
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import parse_cache
+from blob_store import acquire_many, copy_to_incoming, place
+from database import SessionLocal
+from documents import limit_worker_resources, process_documents
+from ingest_queue import MODELS
+from model_registry import SEMANTIC_FEATURES_ENABLED
+from models import ImportRun
+from recruiter_stats import jobs_added
+from tfidf_index import decode_terms, observe_document
+from upload_stream import max_upload_bytes
+from utils import EXTRACTOR_VERSION
+
+load_dotenv()
+
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", 200))
+BULK_IMPORT_WORKERS = int(os.getenv("BULK_IMPORT_WORKERS", os.cpu_count() or 1))
+# Most files handed to a parser worker per task
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 16))
+# Zip archives and file sets uploaded to POST /bulk-imports/... are kept here until imported
+BULK_IMPORT_DIR = os.getenv("BULK_IMPORT_DIR", "imports")
+# Per-file errors kept on the run; the failed count is always exact
+MAX_RECORDED_ERRORS = 1000
+
+_active_runs = set()
+_active_lock = threading.Lock()
+
+
+def _skip(name: str) -> bool:
+    parts = name.replace("\\", "/").split("/")
+    return any(part.startswith(".") or part == "__MACOSX" for part in parts)
+
+
+def list_entries(source: str) -> List[str]:
+    """Files in a directory tree or zip archive, in a stable order"""
+    if os.path.isdir(source):
+        names = []
+        for root, _, files in os.walk(source):
+            for filename in files:
+                names.append(os.path.relpath(os.path.join(root, filename), source))
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        raise ValueError(f"{source} is neither a directory nor a zip archive")
+    return sorted(name for name in names if not _skip(name))
+
+
+@contextmanager
+def open_source(source: str):
+    """Yields a function that opens one entry of the source as a binary file"""
+    if os.path.isdir(source):
+        yield lambda name: open(os.path.join(source, name), "rb")
+    else:
+        with zipfile.ZipFile(source) as archive:
+            yield archive.open
+
+
+class _ParserPool:
+    # Replaces the pool when a worker dies so one bad file only fails itself
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.executor = self._new()
+
+    def _new(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=limit_worker_resources)
+
+    def _run(self, kind: str, batches: list):
+        """One task per batch -> ([(batch, results)], [(batch, error)] for tasks lost to a crash)"""
+        futures = [
+            (batch, self.executor.submit(process_documents, kind, [path for _, path in batch]))
+            for batch in batches
+        ]
+        done, crashed = [], []
+        for batch, future in futures:
+            try:
+                done.append((batch, future.result()))
+            except BrokenProcessPool as e:
+                crashed.append((batch, f"Worker crashed: {e}"))
+        if crashed:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._new()
+        return done, crashed
+
+    def parse(self, kind: str, files: dict):
+        """{content_hash: path} -> ({content_hash: values}, {content_hash: error})"""
+        # Several files per task keeps the per-task pickling and IPC small
+        # next to the parsing; each file still gets its own limits and errors
+        items = list(files.items())
+        chunk = max(1, min(BULK_IMPORT_CHUNK_SIZE, -(-len(items) // self.workers)))
+        pending = [items[start:start + chunk] for start in range(0, len(items), chunk)]
+        parsed, errors, suspects = {}, {}, []
+
+        def collect(done):
+            for batch, results in done:
+                for (content_hash, _), (values, error) in zip(batch, results):
+                    if values is None:
+                        errors[content_hash] = error
+                    else:
+                        parsed[content_hash] = values
+
+        # A dead worker takes every unfinished task with it, good files
+        # included: split those tasks and retry until each is one file
+        while pending:
+            done, crashed = self._run(kind, pending)
+            collect(done)
+            pending = []
+            for batch, _ in crashed:
+                if len(batch) > 1:
+                    half = len(batch) // 2
+                    pending += [batch[:half], batch[half:]]
+                else:
+                    suspects.append(batch)
+        # A single file may still have been lost to another task's crash;
+        # it only fails if it crashes the worker again running on its own
+        for batch in suspects:
+            done, crashed = self._run(kind, [batch])
+            collect(done)
+            for [(content_hash, _)], error in crashed:
+                errors[content_hash] = error
+        return parsed, errors
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+def _record_errors(run: ImportRun, errors: List[dict]):
+    run.failed += len(errors)
+    room = MAX_RECORDED_ERRORS - len(run.errors or [])
+    if errors and room > 0:
+        run.errors = (run.errors or []) + errors[:room]
+
+
+def import_batch(db: Session, run: ImportRun, opener: Callable, pool: _ParserPool, names: List[str], end: int):
+    """Import one batch of entries and move the checkpoint to end, atomically"""
+    model = MODELS[run.kind]
+    staged, errors = [], []
+    for name in names:
+        try:
+            with opener(name) as source:
+                partial, size, content_hash = copy_to_incoming(source, max_upload_bytes(name))
+            staged.append((name, partial, size, content_hash))
+        except Exception as e:
+            errors.append({"file": name, "error": str(e)})
+
+    try:
+        hashes = [content_hash for _, _, _, content_hash in staged]
+        cached = parse_cache.lookup_many(db, run.kind, hashes)
+        to_parse = {}
+        for _, partial, _, content_hash in staged:
+            if content_hash not in cached:
+                to_parse.setdefault(content_hash, partial)
+        parsed, parse_errors = pool.parse(run.kind, to_parse)
+
+        rows, sizes, partials = [], {}, {}
+        for name, partial, size, content_hash in staged:
+            values = cached.get(content_hash) or parsed.get(content_hash)
+            if values is None:
+                errors.append({"file": name, "error": parse_errors.get(content_hash, "Not parsed")})
+                continue
+            rows.append(dict(
+                values,
+                filename=os.path.basename(name),
+                user_id=run.user_id,
+                extractor_version=EXTRACTOR_VERSION,
+                content_hash=content_hash
+            ))
+            sizes[content_hash] = size
+            partials.setdefault(content_hash, partial)
+        counts = Counter(row["content_hash"] for row in rows)
+
+        for attempt in range(2):
+            try:
+                acquire_many(db, sizes, counts)
+                # return_defaults fills in each row's id (one RETURNING insert per batch)
+                db.bulk_insert_mappings(model, rows, return_defaults=True)
+                if run.kind == "job_description":
+                    jobs_added(db, run.user_id, len(rows))
+                run.position = end
+                run.imported += len(rows)
+                run.cached += sum(1 for row in rows if row["content_hash"] in cached)
+                _record_errors(run, errors)
+                run.updated_at = datetime.utcnow()
+                db.commit()
+                break
+            except IntegrityError:
+                # A blob row was created concurrently; the retry updates it instead
+                db.rollback()
+                for row in rows:
+                    row.pop("id", None)
+                if attempt:
+                    raise
+        for content_hash, partial in partials.items():
+            place(partial, content_hash)
+    finally:
+        for _, partial, _, _ in staged:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    parse_cache.store_many(db, run.kind, parsed)
+    terms = [row["tfidf_terms"] for row in rows]
+    if terms:
+        observe_document(decode_terms(terms))
+    if SEMANTIC_FEATURES_ENABLED and rows:
+        from embedding_store import queue_embeddings
+        queue_embeddings(model, [row["id"] for row in rows])
+
+
+def run_import(db: Session, run_id: int, batch_size: int = BULK_IMPORT_BATCH_SIZE,
+               workers: int = BULK_IMPORT_WORKERS, progress: Optional[Callable] = None) -> ImportRun:
+    """Run (or continue) an import from its checkpoint"""
+    run = db.query(ImportRun).filter(ImportRun.id == run_id).first()
+    entries = list_entries(run.source)
+    run.status = "running"
+    run.total = len(entries)
+    run.error = None
+    db.commit()
+
+    pool = _ParserPool(workers)
+    try:
+        with open_source(run.source) as opener:
+            for start in range(run.position, len(entries), batch_size):
+                end = min(start + batch_size, len(entries))
+                import_batch(db, run, opener, pool, entries[start:end], end)
+                if progress:
+                    progress(run)
+        run.status = "done"
+        run.updated_at = datetime.utcnow()
+        db.commit()
+    except BaseException as e:
+        db.rollback()
+        run.status = "interrupted" if isinstance(e, KeyboardInterrupt) else "failed"
+        run.error = f"{type(e).__name__}: {e}"
+        run.updated_at = datetime.utcnow()
+        db.commit()
+        raise
+    finally:
+        pool.shutdown()
+
+    # Uploaded archives and file sets are only kept until the import is done
+    if run.source.startswith(os.path.abspath(BULK_IMPORT_DIR) + os.sep):
+        if os.path.isdir(run.source):
+            shutil.rmtree(run.source)
+        else:
+            os.remove(run.source)
+    return run
+
+
+def create_run(db: Session, source: str, kind: str = "resume", user_id: Optional[int] = None) -> ImportRun:
+    if kind not in MODELS:
+        raise ValueError(f"Unknown document kind: {kind}")
+    run = ImportRun(kind=kind, source=os.path.abspath(source), user_id=user_id, status="queued",
+                    total=0, position=0, imported=0, cached=0, failed=0, errors=[])
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def start_in_background(run_id: int) -> bool:
+    """Run an import on a background thread of this process; False if it already runs here"""
+    with _active_lock:
+        if run_id in _active_runs:
+            return False
+        _active_runs.add(run_id)
+
+    def target():
+        db = SessionLocal()
+        try:
+            run_import(db, run_id)
+        except Exception:
+            pass  # Recorded on the run
+        finally:
+            db.close()
+            with _active_lock:
+                _active_runs.discard(run_id)
+
+    threading.Thread(target=target, name=f"bulk-import-{run_id}", daemon=True).start()
+    return True
+
+
+def run_summary(run: ImportRun) -> dict:
+    return {
+        "import_id": run.id,
+        "kind": run.kind,
+        "status": run.status,
+        "total": run.total,
+        "processed": run.position,
+        "imported": run.imported,
+        "cached": run.cached,
+        "failed": run.failed,
+        "errors": run.errors or [],
+        "error": run.error,
+        "created_at": run.created_at,
+        "updated_at": run.updated_at,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", help="directory or zip archive")
+    parser.add_argument("--kind", choices=sorted(MODELS), default="resume")
+    parser.add_argument("--user-id", type=int, default=None, help="owner of the imported rows")
+    parser.add_argument("--resume", type=int, metavar="IMPORT_ID", help="continue an interrupted import")
+    parser.add_argument("--batch-size", type=int, default=BULK_IMPORT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=BULK_IMPORT_WORKERS)
+    args = parser.parse_args()
+    if not args.source and args.resume is None:
+        parser.error("give a source or --resume IMPORT_ID")
+
+    db = SessionLocal()
+    try:
+        run = db.query(ImportRun).filter(ImportRun.id == args.resume).first() if args.resume \
+            else create_run(db, args.source, args.kind, args.user_id)
+        if run is None:
+            parser.error(f"No import {args.resume}")
+        started = time.perf_counter()
+        first_position = run.position
+
+        def progress(run):
+            rate = (run.position - first_position) / (time.perf_counter() - started)
+            print(f"import {run.id}: {run.position}/{run.total} files, {run.imported} imported "
+                  f"({run.cached} from cache), {run.failed} failed, {rate:.1f} files/s", flush=True)
+
+        print(f"import {run.id}: {run.kind}s from {run.source}, starting at file {run.position}")
+        try:
+            run = run_import(db, run.id, batch_size=args.batch_size, workers=args.workers, progress=progress)
+        except KeyboardInterrupt:
+            print(f"\nInterrupted; continue with: python bulk_import.py --resume {run.id}")
+            return
+        print(f"import {run.id} {run.status}: {run.imported} imported, {run.failed} failed")
+        for error in (run.errors or [])[:20]:
+            print(f"  {error['file']}: {error['error']}")
+        if SEMANTIC_FEATURES_ENABLED and run.imported:
+            from embedding_store import wait_for_queued
+            print("Embedding the imported documents...", flush=True)
+            wait_for_queued()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
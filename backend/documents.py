@@ -0,0 +1,262 @@
+"""Text extraction from uploaded documents and per-document feature extraction.
+
+Formats are handled by the FormatHandler classes in FORMATS (PDF, DOCX,
+plain text). A file's format comes from its leading bytes, not its name;
+register_format adds another one.
+
+Everything here works from a file path alone so it can run in a worker
+process (see ingest_queue.py) without touching the database.
+
+Parsing untrusted files is bounded: workers get an address-space cap
+(PARSER_MEMORY_LIMIT_MB on top of what the process already uses), each
+document gets PARSER_TIMEOUT_SECONDS, and PDFs with more than
+PARSER_MAX_PAGES pages are rejected before any page is extracted.
+"""
+import codecs
+import os
+import signal
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Tuple
+
+import PyPDF2
+from dotenv import load_dotenv
+
+from tfidf_index import encode_terms, term_frequencies
+from utils import extract_job_description_features, extract_resume_info
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+load_dotenv()
+
+PARSER_TIMEOUT_SECONDS = int(os.getenv("PARSER_TIMEOUT_SECONDS", 60))
+PARSER_MAX_PAGES = int(os.getenv("PARSER_MAX_PAGES", 50))
+PARSER_MEMORY_LIMIT_MB = int(os.getenv("PARSER_MEMORY_LIMIT_MB", 1024))
+
+class UnsupportedFormatError(ValueError):
+    pass
+
+
+class DocumentLimitError(ValueError):
+    """The document is over a parser limit; retrying will not help"""
+    pass
+
+
+def _address_space_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def limit_worker_resources():
+    """Process pool initializer: cap how much more memory a parser worker can map.
+
+    Forked workers inherit the parent's mappings (torch, numpy, ...), so the
+    cap is relative to the size the worker starts at.
+    """
+    if resource is None or not PARSER_MEMORY_LIMIT_MB:
+        return
+    limit = _address_space_bytes() + PARSER_MEMORY_LIMIT_MB * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _raise_timeout(signum, frame):
+    raise DocumentLimitError(f"Parsing took longer than {PARSER_TIMEOUT_SECONDS} seconds")
+
+
+class FormatHandler(ABC):
+    """One document format: how to recognise it and how to read its text.
+
+    iter_text yields the text a piece at a time (a page, a paragraph, a block
+    of lines) so callers can stop early without reading the rest; extract_text
+    joins the pieces with `separator`. The processors below still work on the
+    joined text, since it is stored whole as `content` anyway.
+    """
+    name = ""
+    extensions: Tuple[str, ...] = ()
+    separator = "\n"
+
+    @abstractmethod
+    def sniff(self, head: bytes, file_location: str) -> bool:
+        """Whether the file is in this format, from its first SNIFF_BYTES"""
+
+    @abstractmethod
+    def iter_text(self, file_location: str) -> Iterator[str]:
+        """The document's text, a piece at a time"""
+
+
+class PdfHandler(FormatHandler):
+    name = "pdf"
+    extensions = (".pdf",)
+    separator = ""
+
+    def sniff(self, head, file_location):
+        # Readers accept the header anywhere in the first 1 KB
+        return b"%PDF-" in head[:1024]
+
+    def iter_text(self, file_location):
+        with open(file_location, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            if PARSER_MAX_PAGES and len(reader.pages) > PARSER_MAX_PAGES:
+                raise DocumentLimitError(f"PDF has more than {PARSER_MAX_PAGES} pages")
+            for page in reader.pages:
+                yield page.extract_text() or ""
+
+
+class DocxHandler(FormatHandler):
+    name = "docx"
+    extensions = (".docx",)
+
+    def sniff(self, head, file_location):
+        if not head.startswith(b"PK\x03\x04"):
+            return False
+        try:
+            with zipfile.ZipFile(file_location) as archive:
+                return "word/document.xml" in archive.namelist()
+        except zipfile.BadZipFile:
+            return False
+
+    def iter_text(self, file_location):
+        import docx
+        doc = docx.Document(file_location)
+        for para in doc.paragraphs:
+            yield para.text
+
+
+class TextHandler(FormatHandler):
+    name = "txt"
+    extensions = (".txt",)
+    separator = ""
+    block_size = 64 * 1024
+
+    def sniff(self, head, file_location):
+        # No magic number; anything the binary formats above did not claim,
+        # as long as it has no control bytes besides whitespace
+        return not head.translate(None, b"\t\n\r\f").translate(None, bytes(range(32, 256)))
+
+    def _encoding(self, file_location):
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with open(file_location, "rb") as f:
+            try:
+                while block := f.read(self.block_size):
+                    decoder.decode(block)
+                decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                return "latin-1"
+        return "utf-8"
+
+    def iter_text(self, file_location):
+        with open(file_location, "r", encoding=self._encoding(file_location)) as f:
+            while block := f.read(self.block_size):
+                yield block
+
+
+# Sniffed in order: formats with a real signature first, plain text last
+FORMATS: List[FormatHandler] = [PdfHandler(), DocxHandler(), TextHandler()]
+SNIFF_BYTES = 2048
+
+
+def register_format(handler: FormatHandler, before: Optional[str] = "txt"):
+    """Add a format handler, by default ahead of the plain-text fallback"""
+    names = [existing.name for existing in FORMATS]
+    FORMATS.insert(names.index(before) if before in names else len(FORMATS), handler)
+
+
+def supported_extensions() -> Tuple[str, ...]:
+    return tuple(extension for handler in FORMATS for extension in handler.extensions)
+
+
+def detect_format(file_location: str) -> Optional[FormatHandler]:
+    """The handler for a file, judged by its content rather than its name"""
+    with open(file_location, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+    if not head:
+        return None
+    for handler in FORMATS:
+        if handler.sniff(head, file_location):
+            return handler
+    return None
+
+
+def handler_for(file_location: str) -> FormatHandler:
+    handler = detect_format(file_location)
+    if handler is None:
+        raise UnsupportedFormatError(f"Unsupported file format; expected one of {', '.join(supported_extensions())}")
+    return handler
+
+
+def iter_text(file_location: str) -> Iterator[str]:
+    return handler_for(file_location).iter_text(file_location)
+
+
+def extract_text(file_location: str) -> str:
+    handler = handler_for(file_location)
+    return handler.separator.join(handler.iter_text(file_location))
+
+
+def process_resume(file_location: str) -> dict:
+    """Column values for a Resume row"""
+    content = extract_text(file_location)
+    skills, experience, education = extract_resume_info(content)
+    return {
+        "content": content,
+        "skills": ", ".join(skills),
+        "experience": experience,
+        "education": education,
+        "tfidf_terms": encode_terms(term_frequencies([content])),
+    }
+
+
+def process_job_description(file_location: str) -> dict:
+    """Column values for a JobDescription row"""
+    content = extract_text(file_location)
+    return {
+        "content": content,
+        "features": extract_job_description_features(content),
+        "tfidf_terms": encode_terms(term_frequencies([content])),
+    }
+
+
+PROCESSORS = {
+    "resume": process_resume,
+    "job_description": process_job_description,
+}
+
+
+def process_document(kind: str, file_location: str) -> dict:
+    # SIGALRM can only be handled on the main thread, which is where pool
+    # workers run their tasks
+    timed = (PARSER_TIMEOUT_SECONDS > 0 and hasattr(signal, "SIGALRM")
+             and threading.current_thread() is threading.main_thread())
+    if timed:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(PARSER_TIMEOUT_SECONDS)
+    try:
+        return PROCESSORS[kind](file_location)
+    except MemoryError:
+        raise DocumentLimitError(f"Parsing needed more than {PARSER_MEMORY_LIMIT_MB} MB")
+    finally:
+        if timed:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def process_documents(kind: str, file_locations: List[str]) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """process_document over several paths in one worker task.
+
+    Returns (values, None) or (None, error) per file, so one bad file does not
+    fail the rest of the chunk.
+    """
+    results = []
+    for file_location in file_locations:
+        try:
+            results.append((process_document(kind, file_location), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
@@ -0,0 +1,131 @@
+"""Per-document embeddings stored as float16 blobs on Resume/JobDescription.
+
+Vectors are computed once per document (after upload, off the request path)
+and tagged with EMBEDDING_VERSION. Changing the model or pooling changes the
+version, which makes every stored vector stale. Ranking only loads vectors:
+rows without a current one are scored as missing and queued for embedding on
+a background thread, and `python reprocess.py --embeddings` re-embeds them in
+bulk.
+"""
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from model_registry import EMBEDDING_MODEL_NAME
+from semantic import EMBEDDING_MAX_LENGTH, embed_texts
+
+EMBEDDING_VERSION = f"{EMBEDDING_MODEL_NAME}:mean:{EMBEDDING_MAX_LENGTH}:1"
+EMBEDDING_DTYPE = np.float16
+
+# Keeps IN (...) lists well under database parameter limits
+_ID_CHUNK = 1000
+
+# Embeddings queued by requests are computed here, one batch at a time
+_embedder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+_queued = set()  # (table name, id) waiting in _embedder
+_queued_lock = threading.Lock()
+
+
+def encode_vector(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def decode_vector(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE).astype(np.float32)
+
+
+def _chunks(ids: List[int]):
+    for start in range(0, len(ids), _ID_CHUNK):
+        yield ids[start:start + _ID_CHUNK]
+
+
+def embed_documents(db: Session, model, ids: Iterable[int]) -> Dict[int, np.ndarray]:
+    """Embed the given rows from their content and store the vectors"""
+    vectors = {}
+    for chunk in _chunks(list(ids)):
+        rows = db.query(model.id, model.content).filter(model.id.in_(chunk)).all()
+        if not rows:
+            continue
+        embedded = embed_texts([row.content or "" for row in rows])
+        embedded_at = datetime.utcnow()
+        db.bulk_update_mappings(model, [
+            {"id": row.id, "embedding": encode_vector(vector), "embedding_version": EMBEDDING_VERSION,
+             "embedded_at": embedded_at}
+            for row, vector in zip(rows, embedded)
+        ])
+        db.commit()
+        vectors.update((row.id, vector) for row, vector in zip(rows, embedded))
+    return vectors
+
+
+def _embed_queued(model, ids: List[int]):
+    db = SessionLocal()
+    try:
+        embed_documents(db, model, ids)
+    except Exception:
+        traceback.print_exc()
+    finally:
+        db.close()
+        with _queued_lock:
+            _queued.difference_update((model.__tablename__, i) for i in ids)
+
+
+def queue_embeddings(model, ids: Iterable[int]):
+    """Embed these rows in the background (ids already queued are skipped)"""
+    with _queued_lock:
+        new = [i for i in dict.fromkeys(ids) if (model.__tablename__, i) not in _queued]
+        _queued.update((model.__tablename__, i) for i in new)
+    if new:
+        _embedder.submit(_embed_queued, model, new)
+
+
+def wait_for_queued():
+    """Block until everything queued so far has been embedded"""
+    _embedder.submit(lambda: None).result()
+
+
+def load_embeddings(db: Session, model, ids: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """(len(ids), dim) matrix of stored vectors and a mask of the rows that have one.
+
+    Rows without a current vector are zeros and get queued for embedding;
+    nothing is embedded here. dim is 0 when none of the rows has a vector.
+    """
+    vectors = {}
+    for chunk in _chunks(list(dict.fromkeys(ids))):
+        rows = db.query(model.id, model.embedding).filter(
+            model.id.in_(chunk),
+            model.embedding_version == EMBEDDING_VERSION
+        ).all()
+        vectors.update((row.id, decode_vector(row.embedding)) for row in rows if row.embedding)
+
+    found = np.array([i in vectors for i in ids], dtype=bool)
+    if not found.all():
+        queue_embeddings(model, [i for i, present in zip(ids, found) if not present])
+    dim = len(next(iter(vectors.values()))) if vectors else 0
+    matrix = np.zeros((len(ids), dim), dtype=np.float32)
+    for position, i in enumerate(ids):
+        if i in vectors:
+            matrix[position] = vectors[i]
+    return matrix, found
+
+
+def stale_embedding_ids(db: Session, model) -> List[int]:
+    return [row.id for row in db.query(model.id).filter(
+        or_(model.embedding_version.is_(None), model.embedding_version != EMBEDDING_VERSION)
+    ).order_by(model.id)]
+
+
+def embed_document_task(model, document_id: int):
+    """Background task run after an upload has been acknowledged"""
+    db = SessionLocal()
+    try:
+        embed_documents(db, model, [document_id])
+    finally:
+        db.close()
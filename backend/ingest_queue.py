@@ -0,0 +1,278 @@
+"""Background processing of uploaded documents.
+
+Upload endpoints only store the file and insert an IngestJob row, then answer
+202 Accepted with the job id. A dispatcher thread claims queued jobs, runs
+parsing and feature extraction in a process pool (with the resource limits
+from documents.py, off the API event loop) and writes the resulting
+Resume / JobDescription row. Uploads whose content is in the parse cache
+(parse_cache.py) skip the queue and the parser entirely. Either way, IDF
+counts and embeddings for the new document are computed on a background
+thread afterwards.
+
+The jobs table is the queue, so work survives restarts: jobs left
+"processing" by a dead process are requeued once they are older than
+INGEST_STALE_SECONDS. Failures are retried up to INGEST_MAX_ATTEMPTS times.
+
+The dispatcher runs inside each API process by default. Set
+INGEST_IN_PROCESS=false and run `python ingest_queue.py` to run it separately.
+"""
+import os
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+import parse_cache
+from blob_store import release
+from database import SessionLocal
+from documents import DocumentLimitError, UnsupportedFormatError, limit_worker_resources, process_document
+from model_registry import SEMANTIC_FEATURES_ENABLED
+from models import IngestJob, JobDescription, Resume
+from recruiter_stats import jobs_added
+from tfidf_index import decode_terms, observe_document
+from utils import EXTRACTOR_VERSION
+
+load_dotenv()
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", os.cpu_count() or 1))
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", 3))
+INGEST_POLL_SECONDS = float(os.getenv("INGEST_POLL_SECONDS", 2))
+INGEST_STALE_SECONDS = int(os.getenv("INGEST_STALE_SECONDS", 600))
+INGEST_IN_PROCESS = os.getenv("INGEST_IN_PROCESS", "true").lower() in ("1", "true", "yes")
+
+MODELS = {
+    "resume": Resume,
+    "job_description": JobDescription,
+}
+
+# after_store runs here, one document at a time, so neither an upload request
+# (parse cache hit) nor the dispatcher waits on a model forward pass
+_followups = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-followup")
+
+
+def enqueue(db: Session, kind: str, user_id: int, filename: str, file_path: str,
+            content_hash: Optional[str] = None) -> IngestJob:
+    """Queue an upload, or finish it right away if the parse cache has this file"""
+    values = parse_cache.lookup(db, kind, content_hash)
+    job = IngestJob(kind=kind, user_id=user_id, filename=filename, file_path=file_path,
+                    content_hash=content_hash, status="queued")
+    db.add(job)
+    if values is None:
+        db.commit()
+        db.refresh(job)
+        dispatcher.wake()
+        return job
+
+    document = store_result(db, job, values)
+    db.refresh(job)
+    schedule_after_store(kind, document.id, values)
+    return job
+
+
+def store_result(db: Session, job: IngestJob, values: dict):
+    """Insert the processed document and mark the job done"""
+    model = MODELS[job.kind]
+    document = model(
+        filename=job.filename,
+        user_id=job.user_id,
+        extractor_version=EXTRACTOR_VERSION,
+        content_hash=job.content_hash,
+        **values
+    )
+    db.add(document)
+    db.flush()
+    if job.kind == "job_description":
+        jobs_added(db, job.user_id)
+    job.status = "done"
+    job.result_id = document.id
+    job.error = None
+    job.updated_at = datetime.utcnow()
+    db.commit()
+    return document
+
+
+def after_store(kind: str, document_id: int, values: dict):
+    """Work that follows a new document: IDF counts and embeddings"""
+    try:
+        observe_document(decode_terms([values["tfidf_terms"]]))
+        if SEMANTIC_FEATURES_ENABLED:
+            if kind == "resume":
+                from ann_index import index_resume_task
+                index_resume_task(document_id)
+            else:
+                from embedding_store import embed_document_task
+                embed_document_task(MODELS[kind], document_id)
+    except Exception:
+        traceback.print_exc()
+
+
+def schedule_after_store(kind: str, document_id: int, values: dict):
+    """Run after_store in the background"""
+    _followups.submit(after_store, kind, document_id, values)
+
+
+class IngestDispatcher:
+    def __init__(self, workers: int = INGEST_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = self._new_pool()
+        self._thread = threading.Thread(target=self._run, name="ingest-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._executor.shutdown(cancel_futures=True)
+        self._thread = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=limit_worker_resources)
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        pending = {}
+        while not self._stop.is_set():
+            try:
+                self._requeue_stale()
+                for job in self._claim(2 * self.workers - len(pending)):
+                    future = self._executor.submit(process_document, job.kind, job.file_path)
+                    pending[future] = (job.id, self._executor)
+            except Exception:
+                traceback.print_exc()
+
+            if pending:
+                done, _ = wait(pending, timeout=INGEST_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id, executor = pending.pop(future)
+                    try:
+                        self._finish(job_id, executor, future)
+                    except Exception as e:
+                        # Storing the result failed; keep the dispatcher alive
+                        # and give the job back to the queue
+                        traceback.print_exc()
+                        self._finish_failed(job_id, f"{type(e).__name__}: {e}")
+            else:
+                self._wake.wait(INGEST_POLL_SECONDS)
+                self._wake.clear()
+
+    def _claim(self, limit: int):
+        """Atomically move up to limit queued jobs to processing"""
+        if limit <= 0:
+            return []
+        db = SessionLocal()
+        try:
+            candidates = db.query(IngestJob.id).filter(IngestJob.status == "queued").order_by(IngestJob.id).limit(limit).all()
+            claimed = []
+            for (job_id,) in candidates:
+                updated = db.query(IngestJob).filter(
+                    IngestJob.id == job_id,
+                    IngestJob.status == "queued"
+                ).update({
+                    IngestJob.status: "processing",
+                    IngestJob.attempts: IngestJob.attempts + 1,
+                    IngestJob.updated_at: datetime.utcnow()
+                }, synchronize_session=False)
+                db.commit()
+                if updated:
+                    claimed.append(job_id)
+            # Loaded after the last commit, which would expire them
+            jobs = db.query(IngestJob).filter(IngestJob.id.in_(claimed)).order_by(IngestJob.id).all() if claimed else []
+            db.expunge_all()
+            return jobs
+        finally:
+            db.close()
+
+    def _requeue_stale(self):
+        db = SessionLocal()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=INGEST_STALE_SECONDS)
+            stale = db.query(IngestJob).filter(
+                IngestJob.status == "processing",
+                IngestJob.updated_at < cutoff
+            ).all()
+            for job in stale:
+                job.status = "queued" if job.attempts < INGEST_MAX_ATTEMPTS else "failed"
+                job.error = "Processing was interrupted"
+                job.updated_at = datetime.utcnow()
+            db.commit()
+            for job in stale:
+                if job.status == "failed":
+                    release(db, job.content_hash)
+        finally:
+            db.close()
+
+    def _finish(self, job_id: int, executor: ProcessPoolExecutor, future):
+        db = SessionLocal()
+        try:
+            job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+            try:
+                values = future.result()
+            except (UnsupportedFormatError, DocumentLimitError) as e:
+                self._fail(db, job, str(e), retry=False)
+                return
+            except BrokenProcessPool as e:
+                # A worker died (e.g. killed by the OS); start a fresh pool once
+                if executor is self._executor:
+                    self._executor = self._new_pool()
+                self._fail(db, job, f"Worker crashed: {e}", retry=True)
+                return
+            except Exception as e:
+                self._fail(db, job, f"{type(e).__name__}: {e}", retry=True)
+                return
+            document = store_result(db, job, values)
+            kind, document_id = job.kind, document.id
+            parse_cache.store(db, kind, job.content_hash, values)
+        finally:
+            db.close()
+        schedule_after_store(kind, document_id, values)
+
+    def _finish_failed(self, job_id: int, error: str):
+        db = SessionLocal()
+        try:
+            job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+            # Already done if only the cache write or a later step failed
+            if job is not None and job.status == "processing":
+                self._fail(db, job, error, retry=True)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _fail(db: Session, job: IngestJob, error: str, retry: bool):
+        job.error = error
+        job.status = "queued" if retry and job.attempts < INGEST_MAX_ATTEMPTS else "failed"
+        job.updated_at = datetime.utcnow()
+        db.commit()
+        if job.status == "failed":
+            # No document will take over the upload's reference
+            release(db, job.content_hash)
+
+
+dispatcher = IngestDispatcher()
+
+
+if __name__ == "__main__":
+    dispatcher.start()
+    try:
+        dispatcher._thread.join()
+    except KeyboardInterrupt:
+        dispatcher.stop()
@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 import os
 import secrets
+import shutil
+import uuid
+import zipfile
 
 from docx import Document
-import PyPDF2
+import numpy as np
 from fastapi import (
     FastAPI,
     File,
@@ -12,20 +15,29 @@ from fastapi import (
     UploadFile,
     HTTPException,
     Depends,
+    Query,
     status,
-    Request
+    Request,
+    Response
 )
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 
 # Local imports
 import schemas
 import models
-from database import get_db
+from database import SessionLocal, async_engine, engine, get_async_db, get_db, pool_status
 from models import (
     Application,
+    ImportRun,
+    IngestJob,
     JobDescription,
     Resume,
     Session as SessionModel,
@@ -51,14 +63,46 @@ from utils import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     compare_skills,
     create_access_token,
-    extract_job_description_info,
     extract_resume_info,
     get_current_active_user,
     get_current_user,
+    get_current_user_sync,
     get_password_hash,
+    job_required_skills,
     match_resume_to_job,
+    parse_score_weights,
+    parse_stored_skills,
     verify_password
 )  # Make sure these are imported
+from model_registry import SEMANTIC_FEATURES_ENABLED, registry as model_registry
+from ann_index import remove_resume, search_resumes
+from embedding_store import load_embeddings
+from tfidf_index import get_corpus
+from documents import detect_format
+from ingest_queue import INGEST_IN_PROCESS, dispatcher, enqueue
+from upload_stream import UploadSizeLimitMiddleware, stream_upload
+from blob_store import release, remove_legacy_upload, store_upload
+import parse_cache
+import recruiter_stats
+from bulk_import import BULK_IMPORT_DIR, create_run, run_summary, start_in_background
+from pagination import NEXT_CURSOR_HEADER, Page, page_params, paginate_async
+from ranking import (
+    DISPLAY_COLUMNS,
+    EXPORT_FORMATS,
+    RANKING_MODES,
+    SIGNALS,
+    applications_query,
+    candidate_entry,
+    export_ranking,
+    score_rows,
+    scoring_columns,
+    semantic_scores
+)
+
+# Create the tables of a fresh database. Existing databases are upgraded with
+# `alembic upgrade head` (migrations/env.py only imports models, so it never
+# creates tables ahead of the migrations).
+Base.metadata.create_all(bind=engine)
 
 # Initialize FastAPI app
 app = FastAPI()
@@ -69,6 +113,10 @@ os.makedirs("uploads", exist_ok=True)
 # Mount static files for uploads
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
+# Turn away oversized uploads before their body is read (added first so
+# the CORS middleware still wraps its 413)
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -76,124 +124,221 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
+@app.on_event("startup")
+def warmup_models():
+    # Semantic features load their models up front; otherwise nothing is
+    # loaded (or even imported) until first use.
+    if SEMANTIC_FEATURES_ENABLED:
+        model_registry.warmup()
+
+
+@app.on_event("startup")
+def start_ingest_dispatcher():
+    if INGEST_IN_PROCESS:
+        dispatcher.start()
+
 
+@app.on_event("shutdown")
+def stop_ingest_dispatcher():
+    dispatcher.stop()
 
-# File upload endpoint
-@app.post("/upload-resume/")
+
+
+
+# File upload endpoints: store the file and queue it for processing
+async def save_and_enqueue(kind: str, file: UploadFile, current_user: models.User, db: Session):
+    # Store the file by content, check what it really is and queue it
+    content_hash, size, file_location = await store_upload(db, file)
+    if await run_in_threadpool(detect_format, file_location) is None:
+        await run_in_threadpool(release, db, content_hash)
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+    try:
+        job = await run_in_threadpool(enqueue, db, kind, current_user.id, file.filename, file_location, content_hash)
+    except Exception:
+        # No job holds the reference store_upload took
+        await run_in_threadpool(db.rollback)
+        await run_in_threadpool(release, db, content_hash)
+        raise
+    return {
+        "processing_id": job.id,
+        "status": job.status,
+        "filename": file.filename,
+        "size": size,
+        "sha256": content_hash
+    }
+
+
+@app.post("/upload-resume/", status_code=status.HTTP_202_ACCEPTED)
 async def upload_resume(
     file: UploadFile = File(...), 
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_sync),
     db: Session = Depends(get_db)
 ):
-    # Save the uploaded file
-    file_location = f"uploads/{file.filename}"
-    with open(file_location, "wb") as buffer:
-        buffer.write(await file.read())
-
-    # Read the file content
-    if file.filename.endswith(".pdf"):
-        with open(file_location, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            content = "".join(page.extract_text() for page in reader.pages)
-    elif file.filename.endswith(".docx"):
-        import docx
-        doc = docx.Document(file_location)
-        content = "\n".join([para.text for para in doc.paragraphs])
-    elif file.filename.endswith(".txt"):
-        try:
-            with open(file_location, "r", encoding="utf-8") as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            with open(file_location, "r", encoding="latin-1") as f:
-                content = f.read()
-    else:
-        return {"error": "Unsupported file format"}
-
-    # Extract resume info
-    skills, experience, education = extract_resume_info(content)
-    
-    # Convert skills list to comma-separated string for storage
-    skills_str = ", ".join(skills) if isinstance(skills, list) else skills
-
-    # Save to database with user_id
-    db_resume = Resume(
-        filename=file.filename, 
-        content=content,
-        skills=skills_str,
-        experience=experience,
-        education=education,
-        user_id=current_user.id
-    )
-    db.add(db_resume)
-    db.commit()
-    db.refresh(db_resume)
-
-    return {
-        "id": db_resume.id,
-        "filename": file.filename, 
-        "skills": skills, 
-        "experience": experience, 
-        "education": education
-    }
+    return await save_and_enqueue("resume", file, current_user, db)
 
-@app.post("/upload-job-description/")
+@app.post("/upload-job-description/", status_code=status.HTTP_202_ACCEPTED)
 async def upload_job_description(
     file: UploadFile = File(...), 
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_sync),
     db: Session = Depends(get_db)
 ):
-    # Save the uploaded file
-    file_location = f"uploads/{file.filename}"
-    with open(file_location, "wb") as buffer:
-        buffer.write(await file.read())
-
-    # Read the file content
-    if file.filename.endswith(".pdf"):
-        with open(file_location, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            content = "".join(page.extract_text() for page in reader.pages)
-    elif file.filename.endswith(".docx"):
-        import docx
-        doc = docx.Document(file_location)
-        content = "\n".join([para.text for para in doc.paragraphs])
-    elif file.filename.endswith(".txt"):
-        try:
-            with open(file_location, "r", encoding="utf-8") as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            with open(file_location, "r", encoding="latin-1") as f:
-                content = f.read()
-    else:
-        return {"error": "Unsupported file format"}
+    return await save_and_enqueue("job_description", file, current_user, db)
 
-    # Save to database with user_id
-    db_job_description = JobDescription(
-        filename=file.filename,
-        content=content,
-        user_id=current_user.id
-    )
-    db.add(db_job_description)
-    db.commit()
-    db.refresh(db_job_description)
+@app.get("/processing/{processing_id}")
+async def get_processing_status(
+    processing_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await db.scalar(select(IngestJob).where(
+        IngestJob.id == processing_id,
+        IngestJob.user_id == current_user.id
+    ))
+    if not job:
+        raise HTTPException(status_code=404, detail="Processing job not found")
 
-    return {
-        "id": db_job_description.id,
-        "filename": file.filename, 
-        "title": file.filename.replace(".pdf", "").replace(".docx", "").replace(".txt", "").replace("_", " "),
-        "upload_date": db_job_description.upload_date
+    response = {
+        "processing_id": job.id,
+        "kind": job.kind,
+        "filename": job.filename,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "result_id": job.result_id
     }
+    # Same shape the upload endpoints used to return synchronously
+    if job.status == "done" and job.kind == "resume":
+        resume = (await db.execute(select(
+            Resume.id, Resume.filename, Resume.skills, Resume.experience, Resume.education
+        ).where(Resume.id == job.result_id))).first()
+        if resume:
+            response["result"] = {
+                "id": resume.id,
+                "filename": resume.filename,
+                "skills": parse_stored_skills(resume.skills),
+                "experience": resume.experience,
+                "education": resume.education
+            }
+    elif job.status == "done":
+        job_description = (await db.execute(select(
+            JobDescription.id, JobDescription.filename, JobDescription.upload_date, JobDescription.features
+        ).where(JobDescription.id == job.result_id))).first()
+        if job_description:
+            response["result"] = {
+                "id": job_description.id,
+                "filename": job_description.filename,
+                "title": job_description.filename.replace(".pdf", "").replace(".docx", "").replace(".txt", "").replace("_", " "),
+                "upload_date": job_description.upload_date,
+                "skills_required": job_required_skills(job_description)
+            }
+    return response
+
+# Bulk imports: a zip archive (or a set of files) is stored and imported on a
+# background thread
+async def start_bulk_import(kind: str, files: List[UploadFile], current_user: models.User, db: Session):
+    os.makedirs(BULK_IMPORT_DIR, exist_ok=True)
+    if len(files) == 1 and files[0].filename.lower().endswith(".zip"):
+        source = os.path.abspath(os.path.join(BULK_IMPORT_DIR, f"{uuid.uuid4().hex}.zip"))
+        await stream_upload(files[0], source)
+        if not zipfile.is_zipfile(source):
+            os.remove(source)
+            raise HTTPException(status_code=400, detail="Upload a zip archive")
+    else:
+        source = os.path.abspath(os.path.join(BULK_IMPORT_DIR, uuid.uuid4().hex))
+        os.makedirs(source)
+        try:
+            for index, file in enumerate(files):
+                # Index prefix keeps the upload order and same-named files apart
+                folder = os.path.join(source, f"{index:05d}")
+                os.makedirs(folder)
+                await stream_upload(file, os.path.join(folder, os.path.basename(file.filename) or "file"))
+        except BaseException:
+            shutil.rmtree(source)
+            raise
+
+    run = await run_in_threadpool(create_run, db, source, kind, current_user.id)
+    start_in_background(run.id)
+    return run_summary(run)
+
+
+def get_own_import(import_id: int, current_user: models.User, db: Session) -> ImportRun:
+    run = db.query(ImportRun).filter(ImportRun.id == import_id).first()
+    if not run or run.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return run
+
+
+@app.post("/bulk-imports/resumes", status_code=status.HTTP_202_ACCEPTED)
+async def bulk_import_resumes(
+    file: UploadFile = File(...),
+    current_user: models.User = Depends(get_current_user_sync),
+    db: Session = Depends(get_db)
+):
+    if current_user.role != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can bulk import resumes")
+    # Zip archives only; start_bulk_import would take any other file as a set of one
+    if not file.filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Upload a zip archive")
+    return await start_bulk_import("resume", [file], current_user, db)
 
+@app.post("/bulk-imports/job-descriptions", status_code=status.HTTP_202_ACCEPTED)
+async def bulk_import_job_descriptions(
+    files: List[UploadFile] = File(...),
+    current_user: models.User = Depends(get_current_user_sync),
+    db: Session = Depends(get_db)
+):
+    """Post many job descriptions at once: several files or one zip archive"""
+    if current_user.role != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can import job postings")
+    return await start_bulk_import("job_description", files, current_user, db)
+
+@app.get("/bulk-imports/{import_id}")
+def get_bulk_import(
+    import_id: int,
+    current_user: models.User = Depends(get_current_user_sync),
+    db: Session = Depends(get_db)
+):
+    return run_summary(get_own_import(import_id, current_user, db))
+
+@app.post("/bulk-imports/{import_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+def resume_bulk_import(
+    import_id: int,
+    current_user: models.User = Depends(get_current_user_sync),
+    db: Session = Depends(get_db)
+):
+    run = get_own_import(import_id, current_user, db)
+    if run.status == "done":
+        raise HTTPException(status_code=400, detail="Import already finished")
+    # A "running" import that is not running here was cut off by a restart
+    if not start_in_background(run.id):
+        raise HTTPException(status_code=409, detail="Import is already running")
+    return run_summary(run)
+
+# Ranking and sourcing are CPU-bound (NumPy over the whole applicant pool), so
+# they are plain functions that FastAPI runs in its threadpool
 @app.get("/rank-candidates/")
-async def rank_candidates(
+def rank_candidates(
     job_description_id: int, 
+    mode: str = "composite",
+    weights: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: UserModel = Depends(get_current_user_sync)
 ):
-    # Retrieve the job description
-    job_description = db.query(JobDescription).filter(JobDescription.id == job_description_id).first()
+    if mode not in RANKING_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Use: {', '.join(RANKING_MODES)}")
+    try:
+        score_weights = parse_score_weights(weights) if weights else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Retrieve the job description (its term vector is deferred by default)
+    job_description = db.query(JobDescription).options(undefer(JobDescription.tfidf_terms)).filter(
+        JobDescription.id == job_description_id
+    ).first()
     if not job_description:
         raise HTTPException(status_code=404, detail="Job description not found")
     
@@ -201,52 +346,152 @@ async def rank_candidates(
     if job_description.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only view candidates for your own job postings")
 
-    job_skills = extract_job_description_info(job_description.content)
+    job_skills = job_required_skills(job_description)
 
-    # Only get resumes from candidates who applied to THIS job
-    applications = db.query(Application).filter(Application.job_id == job_description_id).all()
+    # Only get resumes from candidates who applied to THIS job. Ranking reads
+    # the features stored at upload and never loads Resume.content.
+    applications = applications_query(
+        db, job_description_id, list(DISPLAY_COLUMNS) + scoring_columns(mode)
+    ).order_by(Application.id).all()
     
     if not applications:
         return {"ranked_candidates": [], "message": "No applications yet for this job"}
 
-    ranked_candidates = []
-    for app in applications:
-        resume = app.resume
-        if not resume:
-            continue
-            
-        # Extract skills from the resume
-        resume_skills, experience, education = extract_resume_info(resume.content)
-
-        # Compare skills to find matches
-        matching_skills = compare_skills(resume_skills, job_skills)
-
-        # Calculate match score (e.g., based on the number of matching skills)
-        match_score = len(matching_skills) / len(job_skills) if job_skills else 0
-
-        ranked_candidates.append({
-            "resume_id": resume.id,
-            "filename": resume.filename,
-            "applicant_email": app.user.email if app.user else "Unknown",
-            "application_id": app.id,
-            "application_status": app.status,
-            "match_score": match_score,
-            "matching_skills": matching_skills,
-        })
+    pending = 0
+    if mode == "semantic":
+        scores, found = semantic_scores(db, job_description, [row.resume_id for row in applications])
+        if scores is None:
+            return {"ranked_candidates": [], "message": "The job posting is still being embedded; try again shortly"}
+        signals, pending = None, int((~found).sum())
+    else:
+        corpus = get_corpus(db) if mode in ("composite", "text") else None
+        scores, signals = score_rows(db, mode, job_description, applications, corpus, score_weights)
 
     # Sort candidates by match score (descending order)
-    ranked_candidates.sort(key=lambda x: x["match_score"], reverse=True)
+    ranked_candidates = []
+    for i in np.argsort(-scores, kind="stable").tolist():
+        breakdown = {name: float(signals[name][i]) for name in SIGNALS} if signals is not None else None
+        ranked_candidates.append(candidate_entry(applications[i], scores[i], job_skills, breakdown))
 
+    if pending:
+        return {
+            "ranked_candidates": ranked_candidates,
+            "pending_embeddings": pending,
+            "message": f"{pending} resume(s) are still being embedded and score 0 for now; try again shortly"
+        }
     return {"ranked_candidates": ranked_candidates}
 
+
+@app.get("/rank-candidates/export")
+def export_ranked_candidates(
+    job_description_id: int,
+    mode: str = "composite",
+    format: str = "ndjson",
+    weights: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user_sync)
+):
+    """The full ranking streamed as NDJSON or CSV, with bounded memory"""
+    if mode not in RANKING_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Use: {', '.join(RANKING_MODES)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Use: {', '.join(EXPORT_FORMATS)}")
+    try:
+        score_weights = parse_score_weights(weights) if weights else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job = db.query(JobDescription.id, JobDescription.user_id).filter(JobDescription.id == job_description_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    if job.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You can only view candidates for your own job postings")
+    if mode == "semantic":
+        # Nothing to rank against yet (queued by load_embeddings); resumes
+        # still waiting for their vectors score 0
+        _, job_found = load_embeddings(db, JobDescription, [job.id])
+        if not job_found[0]:
+            raise HTTPException(status_code=409, detail="The job posting is still being embedded; try again shortly")
+
+    def lines():
+        # The request's session is closed once the endpoint returns; the
+        # stream runs in the threadpool with its own
+        export_db = SessionLocal()
+        try:
+            yield from export_ranking(export_db, job_description_id, mode, format, score_weights)
+        finally:
+            export_db.close()
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"ranking_job_{job_description_id}_{mode}.{format}"
+    return StreamingResponse(lines(), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@app.get("/source-candidates/")
+def source_candidates(
+    job_description_id: int,
+    k: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user_sync)
+):
+    """Top-k most similar resumes across the whole resume pool, applied or not"""
+    job_description = db.query(JobDescription).filter(JobDescription.id == job_description_id).first()
+    if not job_description:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    if job_description.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You can only source candidates for your own job postings")
+
+    job_vector, job_found = load_embeddings(db, JobDescription, [job_description.id])
+    if not job_found[0]:
+        # Queued by load_embeddings
+        return {"candidates": [], "message": "The job posting is still being embedded; try again shortly"}
+    found = search_resumes(db, job_vector[0], k)
+    if found is None:
+        return {"candidates": [], "message": "No resume embeddings available yet"}
+
+    resume_ids, scores = found
+    rows = db.query(
+        Resume.id,
+        Resume.filename,
+        Resume.skills,
+        User.email
+    ).outerjoin(User, Resume.user_id == User.id).filter(Resume.id.in_(resume_ids.tolist())).all()
+    rows_by_id = {row.id: row for row in rows}
+
+    job_skills = job_required_skills(job_description)
+    candidates = []
+    for resume_id, score in zip(resume_ids.tolist(), scores.tolist()):
+        row = rows_by_id.get(resume_id)
+        if row is None:
+            # Deleted by another worker since the index last synced
+            remove_resume(resume_id)
+            continue
+        candidates.append({
+            "resume_id": row.id,
+            "filename": row.filename,
+            "applicant_email": row.email or "Unknown",
+            "similarity": score,
+            "matching_skills": compare_skills(parse_stored_skills(row.skills), job_skills),
+        })
+
+    return {"candidates": candidates}
+
 # New endpoint to list all job descriptions (for current recruiter)
 @app.get("/job-descriptions/")
-def get_job_descriptions(
-    db: Session = Depends(get_db),
+async def get_job_descriptions(
+    response: Response,
+    page: Page = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     # Only return jobs belonging to the current recruiter
-    jobs = db.query(JobDescription).filter(JobDescription.user_id == current_user.id).all()
+    jobs = await paginate_async(
+        db,
+        select(JobDescription.id, JobDescription.filename, JobDescription.upload_date).where(
+            JobDescription.user_id == current_user.id
+        ),
+        JobDescription.id, page, response
+    )
     return [{
         "id": job.id,
         "filename": job.filename,
@@ -257,9 +502,9 @@ def get_job_descriptions(
 
 # Delete job description endpoint
 @app.delete("/job-descriptions/{job_id}")
-def delete_job_description(
+async def delete_job_description(
     job_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     # Check if user is a recruiter
@@ -267,7 +512,9 @@ def delete_job_description(
         raise HTTPException(status_code=403, detail="Only recruiters can delete job postings")
     
     # Find the job description
-    job = db.query(JobDescription).filter(JobDescription.id == job_id).first()
+    job = (await db.execute(select(
+        JobDescription.id, JobDescription.user_id, JobDescription.content_hash, JobDescription.filename
+    ).where(JobDescription.id == job_id))).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job description not found")
     
@@ -275,17 +522,15 @@ def delete_job_description(
     if job.user_id and job.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only delete your own job postings")
     
-    # Delete the file from uploads folder
-    file_path = os.path.join("uploads", job.filename)
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-        except Exception as e:
-            print(f"Error deleting file: {e}")
-    
-    # Delete from database
-    db.delete(job)
-    db.commit()
+    # Delete from database, then drop its reference to the stored file. The
+    # shared sync helpers run on this session's connection via run_sync.
+    await db.run_sync(recruiter_stats.job_removed, job.id, job.user_id)
+    await db.execute(delete(JobDescription).where(JobDescription.id == job_id))
+    await db.commit()
+    if job.content_hash:
+        await db.run_sync(release, job.content_hash)
+    else:
+        await db.run_sync(remove_legacy_upload, job.filename)
     
     return {"message": "Job description deleted successfully"}
 
@@ -309,10 +554,11 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
 async def login_for_access_token(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(UserModel).filter(UserModel.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await db.scalar(select(UserModel).where(UserModel.email == form_data.username))
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not user or not await run_in_threadpool(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=401,
             detail="Incorrect email or password",
@@ -334,7 +580,7 @@ async def login_for_access_token(
         ip_address=request.client.host if request.client else None
     )
     db.add(session)
-    db.commit()
+    await db.commit()
     
     # Return both token and role
     return {
@@ -347,22 +593,19 @@ async def login_for_access_token(
 @app.post("/logout")
 async def logout(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(models.oauth2_scheme) if hasattr(models, 'oauth2_scheme') else None
 ):
     """Invalidate the current session"""
     from utils import oauth2_scheme
     # Get token from header and invalidate it
     # We need to get the token differently since it's already validated
-    sessions = db.query(SessionModel).filter(
+    await db.execute(update(SessionModel).where(
         SessionModel.user_id == current_user.id,
         SessionModel.is_active == True
-    ).all()
-    
-    for session in sessions:
-        session.is_active = False
+    ).values(is_active=False))
     
-    db.commit()
+    await db.commit()
     return {"message": "Successfully logged out"}
 
 
@@ -370,33 +613,39 @@ async def logout(
 async def logout_current_session(
     request: Request,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Invalidate only the current session (current device)"""
     auth_header = request.headers.get("authorization", "")
     if auth_header.startswith("Bearer "):
         token = auth_header[7:]
-        session = db.query(SessionModel).filter(
+        await db.execute(update(SessionModel).where(
             SessionModel.token == token,
             SessionModel.is_active == True
-        ).first()
-        if session:
-            session.is_active = False
-            db.commit()
+        ).values(is_active=False))
+        await db.commit()
     return {"message": "Successfully logged out from current device"}
 
 
 @app.get("/sessions")
 async def get_active_sessions(
+    response: Response,
+    page: Page = Depends(page_params),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all active sessions for the current user"""
-    sessions = db.query(SessionModel).filter(
+    """Get the active sessions for the current user, newest first"""
+    sessions = await paginate_async(db, select(
+        SessionModel.id,
+        SessionModel.created_at,
+        SessionModel.expires_at,
+        SessionModel.device_info,
+        SessionModel.ip_address
+    ).where(
         SessionModel.user_id == current_user.id,
         SessionModel.is_active == True,
         SessionModel.expires_at > datetime.utcnow()
-    ).all()
+    ), SessionModel.id, page, response)
     
     return [
         {
@@ -414,26 +663,24 @@ async def get_active_sessions(
 async def revoke_session(
     session_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Revoke a specific session (logout from a specific device)"""
-    session = db.query(SessionModel).filter(
+    result = await db.execute(update(SessionModel).where(
         SessionModel.id == session_id,
         SessionModel.user_id == current_user.id
-    ).first()
+    ).values(is_active=False))
     
-    if not session:
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session.is_active = False
-    db.commit()
+    await db.commit()
     return {"message": "Session revoked successfully"}
 
 
 @app.get("/users/me", response_model=schemas.UserProfile)
 async def read_users_me(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)  # Include this if needed for additional queries
+    current_user: models.User = Depends(get_current_user)
 ):
     return current_user
 
@@ -443,7 +690,7 @@ async def update_user_me(
     current_password: Optional[str] = Form(None),
     new_password: Optional[str] = Form(None),
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)  # The session current_user was loaded in
 ):
     # Handle profile picture update
     if profile_picture:
@@ -454,8 +701,7 @@ async def update_user_me(
         file_location = f"uploads/profile_pictures/user_{current_user.id}_{profile_picture.filename}"
         
         # Save file
-        with open(file_location, "wb") as buffer:
-            buffer.write(await profile_picture.read())
+        await stream_upload(profile_picture, file_location)
         
         # Update profile picture path
         current_user.profile_picture = f"/{file_location}"
@@ -463,27 +709,34 @@ async def update_user_me(
     # Handle password change
     if current_password and new_password:
         # Verify current password
-        if not verify_password(current_password, current_user.hashed_password):
+        if not await run_in_threadpool(verify_password, current_password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
         
         # Update to new password
-        current_user.hashed_password = get_password_hash(new_password)
+        current_user.hashed_password = await run_in_threadpool(get_password_hash, new_password)
     
     # Commit changes to database
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
     
     return current_user
 
 @app.get("/resumes/me")
 async def get_user_resumes(
+    response: Response,
+    page: Page = Depends(page_params),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    resumes = db.query(Resume).filter(Resume.user_id == current_user.id).all()
+    resumes = await paginate_async(
+        db,
+        select(Resume.id, Resume.filename, Resume.skills, Resume.experience, Resume.education).where(
+            Resume.user_id == current_user.id
+        ),
+        Resume.id, page, response
+    )
     return [{
         "id": resume.id,
         "filename": resume.filename,
@@ -497,10 +750,12 @@ async def get_user_resumes(
 async def delete_resume(
     resume_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Find the resume
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = (await db.execute(select(
+        Resume.id, Resume.user_id, Resume.content_hash, Resume.filename
+    ).where(Resume.id == resume_id))).first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
@@ -508,36 +763,44 @@ async def delete_resume(
     if resume.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only delete your own resumes")
     
-    # Delete the file from uploads folder
-    file_path = os.path.join("uploads", resume.filename)
-    if os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-        except Exception as e:
-            print(f"Error deleting file: {e}")
-    
-    # Delete from database
-    db.delete(resume)
-    db.commit()
+    # Delete from database, then drop its reference to the stored file
+    await db.execute(delete(Resume).where(Resume.id == resume_id))
+    await db.commit()
+    if resume.content_hash:
+        await db.run_sync(release, resume.content_hash)
+    else:
+        await db.run_sync(remove_legacy_upload, resume.filename)
+    remove_resume(resume_id)
     
     return {"message": "Resume deleted successfully"}
 
 
 @app.get("/applications")
 async def get_user_applications(
+    response: Response,
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all applications for the current user"""
-    applications = db.query(Application).filter(
-        Application.user_id == current_user.id
-    ).all()
+    """Get the current user's applications, newest first"""
+    # One query: only the columns shown, never the documents' content
+    applications = select(
+        Application.id,
+        Application.job_id,
+        Application.status,
+        Application.applied_date,
+        JobDescription.filename.label("job_filename"),
+        Resume.filename.label("resume_filename")
+    ).outerjoin(JobDescription, Application.job_id == JobDescription.id).outerjoin(
+        Resume, Application.resume_id == Resume.id
+    ).where(Application.user_id == current_user.id)
+    applications = await paginate_async(db, applications, Application.id, page, response)
     
     return [{
         "id": app.id,
         "job_id": app.job_id,
-        "job_title": app.job.filename.replace(".pdf", "").replace(".docx", "").replace(".txt", "").replace("_", " ") if app.job else "Unknown",
-        "resume_filename": app.resume.filename if app.resume else "Unknown",
+        "job_title": app.job_filename.replace(".pdf", "").replace(".docx", "").replace(".txt", "").replace("_", " ") if app.job_filename else "Unknown",
+        "resume_filename": app.resume_filename or "Unknown",
         "status": app.status,
         "applied_date": app.applied_date
     } for app in applications]
@@ -548,24 +811,28 @@ async def create_application(
     job_id: int = Form(...),
     resume_id: int = Form(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Apply to a job with a resume"""
     # Check if job exists
-    job = db.query(JobDescription).filter(JobDescription.id == job_id).first()
+    job = (await db.execute(select(
+        JobDescription.id, JobDescription.user_id, JobDescription.filename
+    ).where(JobDescription.id == job_id))).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Check if resume exists and belongs to user
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
+    resume = (await db.execute(select(Resume.filename).where(
+        Resume.id == resume_id, Resume.user_id == current_user.id
+    ))).first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found or doesn't belong to you")
     
     # Check if already applied
-    existing = db.query(Application).filter(
+    existing = await db.scalar(select(Application.id).where(
         Application.user_id == current_user.id,
         Application.job_id == job_id
-    ).first()
+    ))
     if existing:
         raise HTTPException(status_code=400, detail="You have already applied to this job")
     
@@ -577,8 +844,16 @@ async def create_application(
         status="pending"
     )
     db.add(application)
-    db.commit()
-    db.refresh(application)
+    try:
+        # Insert now so the unique (user_id, job_id) constraint is checked
+        # before the counters are touched
+        await db.flush()
+    except IntegrityError:
+        # A concurrent request for the same job got in first
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="You have already applied to this job")
+    await db.run_sync(recruiter_stats.application_added, job.user_id, current_user.id)
+    await db.commit()
     
     return {
         "id": application.id,
@@ -593,102 +868,125 @@ async def create_application(
 
 @app.get("/jobs/available")
 async def get_available_jobs(
+    response: Response,
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all available job postings for applicants to browse"""
-    jobs = db.query(JobDescription).all()
+    """Get available job postings for applicants to browse, newest first"""
+    jobs = await paginate_async(
+        db,
+        select(JobDescription.id, JobDescription.filename, JobDescription.upload_date, JobDescription.features),
+        JobDescription.id, page, response
+    )
     return [{
         "id": job.id,
         "title": job.filename.replace(".pdf", "").replace(".docx", "").replace(".txt", "").replace("_", " "),
         "filename": job.filename,
         "upload_date": job.upload_date,
-        "skills_required": extract_job_description_info(job.content) if job.content else []
+        "skills_required": job_required_skills(job)
     } for job in jobs]
 
 
 @app.get("/stats/recruiter")
 async def get_recruiter_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get stats for recruiter dashboard"""
     if current_user.role != "recruiter":
         raise HTTPException(status_code=403, detail="Access denied. Recruiters only.")
     
-    # Count unique candidates who applied to this recruiter's jobs
-    total_candidates = db.query(Application.user_id).join(JobDescription).filter(
-        JobDescription.user_id == current_user.id
-    ).distinct().count()
-    
-    total_jobs = db.query(JobDescription).filter(JobDescription.user_id == current_user.id).count()
-    total_applications = db.query(Application).join(JobDescription).filter(
-        JobDescription.user_id == current_user.id
-    ).count()
-    
+    # Counters kept up to date as jobs and applications come and go
+    return await db.run_sync(recruiter_stats.get_stats, current_user.id)
+
+
+# Columns behind the applicant part of the recruiter listings; fetched with
+# joins in the listing query instead of lazy-loading user/resume per row
+APPLICANT_COLUMNS = (
+    Application.id,
+    Application.user_id,
+    Application.resume_id,
+    Application.status,
+    Application.applied_date,
+    User.email,
+    Resume.filename.label("resume_filename"),
+    Resume.skills.label("resume_skills")
+)
+
+
+def applicant_fields(app) -> dict:
     return {
-        "total_candidates": total_candidates,
-        "active_jobs": total_jobs,
-        "total_applications": total_applications
+        "applicant_email": app.email or "Unknown",
+        "applicant_id": app.user_id,
+        "resume_id": app.resume_id,
+        "resume_filename": app.resume_filename or "Unknown",
+        "resume_skills": app.resume_skills or "",
+        "status": app.status,
+        "applied_date": app.applied_date
     }
 
 
 @app.get("/recruiter/applications")
 async def get_recruiter_applications(
+    response: Response,
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all applications for jobs posted by this recruiter"""
+    """Get applications for jobs posted by this recruiter, newest first"""
     if current_user.role != "recruiter":
         raise HTTPException(status_code=403, detail="Access denied. Recruiters only.")
     
-    applications = db.query(Application).join(JobDescription).filter(
+    applications = select(
+        *APPLICANT_COLUMNS,
+        Application.job_id,
+        JobDescription.filename.label("job_filename")
+    ).join(JobDescription, Application.job_id == JobDescription.id).outerjoin(
+        User, Application.user_id == User.id
+    ).outerjoin(Resume, Application.resume_id == Resume.id).where(
         JobDescription.user_id == current_user.id
-    ).all()
+    )
+    applications = await paginate_async(db, applications, Application.id, page, response)
     
     return [{
         "id": app.id,
         "job_id": app.job_id,
-        "job_title": app.job.filename.replace(".pdf", "").replace(".docx", "").replace(".txt", "").replace("_", " ") if app.job else "Unknown",
-        "applicant_email": app.user.email if app.user else "Unknown",
-        "applicant_id": app.user_id,
-        "resume_id": app.resume_id,
-        "resume_filename": app.resume.filename if app.resume else "Unknown",
-        "resume_skills": app.resume.skills if app.resume else "",
-        "status": app.status,
-        "applied_date": app.applied_date
+        "job_title": app.job_filename.replace(".pdf", "").replace(".docx", "").replace(".txt", "").replace("_", " "),
+        **applicant_fields(app)
     } for app in applications]
 
 
 @app.get("/recruiter/applications/{job_id}")
 async def get_job_applications(
     job_id: int,
+    response: Response,
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all applications for a specific job"""
+    """Get applications for a specific job, newest first"""
     if current_user.role != "recruiter":
         raise HTTPException(status_code=403, detail="Access denied. Recruiters only.")
     
     # Verify job belongs to this recruiter
-    job = db.query(JobDescription).filter(
+    job = await db.scalar(select(JobDescription.id).where(
         JobDescription.id == job_id,
         JobDescription.user_id == current_user.id
-    ).first()
+    ))
     if not job:
         raise HTTPException(status_code=404, detail="Job not found or doesn't belong to you")
     
-    applications = db.query(Application).filter(Application.job_id == job_id).all()
+    applications = select(*APPLICANT_COLUMNS).outerjoin(
+        User, Application.user_id == User.id
+    ).outerjoin(Resume, Application.resume_id == Resume.id).where(
+        Application.job_id == job_id
+    )
+    applications = await paginate_async(db, applications, Application.id, page, response)
     
     return [{
         "id": app.id,
-        "applicant_email": app.user.email if app.user else "Unknown",
-        "applicant_id": app.user_id,
-        "resume_id": app.resume_id,
-        "resume_filename": app.resume.filename if app.resume else "Unknown",
-        "resume_skills": app.resume.skills if app.resume else "",
-        "status": app.status,
-        "applied_date": app.applied_date
+        **applicant_fields(app)
     } for app in applications]
 
 
@@ -697,7 +995,7 @@ async def update_application_status(
     application_id: int,
     status: str = Form(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Accept or decline an application"""
     if current_user.role != "recruiter":
@@ -707,20 +1005,57 @@ async def update_application_status(
         raise HTTPException(status_code=400, detail="Invalid status. Use: pending, reviewed, accepted, or rejected")
     
     # Get the application and verify it belongs to this recruiter's job
-    application = db.query(Application).join(JobDescription).filter(
+    application = await db.scalar(select(Application).join(
+        JobDescription, Application.job_id == JobDescription.id
+    ).where(
         Application.id == application_id,
         JobDescription.user_id == current_user.id
-    ).first()
+    ))
     
     if not application:
         raise HTTPException(status_code=404, detail="Application not found or doesn't belong to your job posting")
     
     application.status = status
-    db.commit()
-    db.refresh(application)
+    await db.commit()
     
     return {
         "id": application.id,
         "status": application.status,
         "message": f"Application {status} successfully"
-    }
\ No newline at end of file
+    }
+
+
+@app.get("/models")
+async def get_model_status(current_user: User = Depends(get_current_user)):
+    """Load state, load time and memory of the NLP models"""
+    return {
+        "semantic_features_enabled": SEMANTIC_FEATURES_ENABLED,
+        "models": model_registry.stats()
+    }
+
+
+@app.post("/models/warmup")
+def warmup_model_registry(current_user: User = Depends(get_current_user)):
+    """Load every registered model now instead of on first use"""
+    if current_user.role != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can warm up the models")
+    return {"models": model_registry.warmup()}
+
+
+@app.get("/parse-cache")
+def get_parse_cache_stats(
+    current_user: User = Depends(get_current_user_sync),
+    db: Session = Depends(get_db)
+):
+    """Size and hit/miss counters of the parse result cache"""
+    if current_user.role != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can view parse cache stats")
+    return parse_cache.stats(db)
+
+
+@app.get("/db-pool")
+def get_db_pool_stats(current_user: User = Depends(get_current_user)):
+    """Connection pool occupancy and connection-acquire wait times, per engine"""
+    if current_user.role != "recruiter":
+        raise HTTPException(status_code=403, detail="Only recruiters can view connection pool stats")
+    return {"sync": pool_status(engine), "async": pool_status(async_engine)}
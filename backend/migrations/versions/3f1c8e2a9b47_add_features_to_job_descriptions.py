@@ -0,0 +1,46 @@
+"""add features to job_descriptions
+
+Revision ID: 3f1c8e2a9b47
+Revises: 9ad39b853eea
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c8e2a9b47'
+down_revision: Union[str, None] = '9ad39b853eea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_descriptions', sa.Column('features', sa.JSON(), nullable=True))
+
+    # Backfill existing postings so read paths never have to extract
+    from utils import extract_job_description_features
+
+    job_descriptions = sa.table(
+        'job_descriptions',
+        sa.column('id', sa.Integer),
+        sa.column('content', sa.Text),
+        sa.column('features', sa.JSON),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(job_descriptions.c.id, job_descriptions.c.content)).fetchall()
+    for job_id, content in rows:
+        bind.execute(
+            job_descriptions.update()
+            .where(job_descriptions.c.id == job_id)
+            .values(features=extract_job_description_features(content or ""))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job_descriptions', 'features')
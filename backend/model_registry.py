@@ -0,0 +1,97 @@
+"""Lazy registry for the heavy NLP models used by semantic features.
+
+Nothing here imports transformers or torch at module import. A model is only
+loaded the first time it is requested, or when warmed up explicitly (at
+startup when SEMANTIC_FEATURES_ENABLED is set, or via POST /models/warmup).
+"""
+import os
+import resource
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SEMANTIC_FEATURES_ENABLED = os.getenv("SEMANTIC_FEATURES_ENABLED", "false").lower() in ("1", "true", "yes")
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "bert-base-uncased")
+# torch intra-op threads, set once when a model loads; 0 keeps torch's
+# default (one thread per physical core)
+EMBEDDING_NUM_THREADS = int(os.getenv("EMBEDDING_NUM_THREADS", 0))
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS; close enough for a delta
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], object]] = {}
+        self._models: Dict[str, object] = {}
+        self._stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], object]):
+        self._loaders[name] = loader
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str):
+        """Return the model, loading it on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            if name not in self._models:
+                if name not in self._loaders:
+                    raise KeyError(f"Unknown model: {name}")
+                rss_before = _current_rss_bytes()
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self._stats[name] = {
+                    "load_seconds": round(time.perf_counter() - start, 3),
+                    "rss_delta_mb": round((_current_rss_bytes() - rss_before) / (1024 * 1024), 1),
+                    "loaded_at": time.time(),
+                }
+            return self._models[name]
+
+    def warmup(self, names: Optional[Iterable[str]] = None):
+        for name in names or list(self._loaders):
+            self.get(name)
+        return self.stats()
+
+    def unload(self, name: str):
+        with self._lock:
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+
+    def stats(self):
+        return {
+            name: {"loaded": name in self._models, **self._stats.get(name, {})}
+            for name in self._loaders
+        }
+
+
+def load_transformer(model_name: str):
+    """Tokenizer and encoder for a Hugging Face model"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    if EMBEDDING_NUM_THREADS:
+        torch.set_num_threads(EMBEDDING_NUM_THREADS)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+    return tokenizer, model
+
+
+registry = ModelRegistry()
+registry.register("embedding", lambda: load_transformer(EMBEDDING_MODEL_NAME))
@@ -1,6 +1,6 @@
-from sqlalchemy import Boolean, DateTime, ForeignKey, create_engine, Column, Integer, String, Text
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, LargeBinary, UniqueConstraint, Column, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import deferred
 from dotenv import load_dotenv
 import os
 from datetime import datetime
@@ -10,12 +10,8 @@ from sqlalchemy.orm import relationship  # Add this import
 # Load environment variables
 load_dotenv()
 
-# Database URL
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-# Create database engine
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# The process-wide engine and sessions, see database.py
+from database import SessionLocal, engine
 
 # Base class for models
 Base = declarative_base()
@@ -23,12 +19,20 @@ Base = declarative_base()
 # Resume model
 class Resume(Base):
     __tablename__ = "resumes"
+    # (user_id, id): a user's resumes in the keyset order of /resumes/me
+    __table_args__ = (Index("ix_resumes_user_id_id", "user_id", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, index=True)
-    content = Column(Text)
+    content = deferred(Column(Text))  # Raw text; undefer() where it is really needed
     skills = Column(Text)
     experience = Column(Text)
     education = Column(Text)
+    extractor_version = Column(Integer)  # utils.EXTRACTOR_VERSION used for skills/experience/education
+    embedding = deferred(Column(LargeBinary))  # float16 vector, see embedding_store.py
+    embedding_version = Column(String)
+    embedded_at = Column(DateTime, index=True)  # When embedding was last written; ann_index syncs from it
+    tfidf_terms = deferred(Column(LargeBinary))  # Hashed term frequencies, see tfidf_index.py
+    content_hash = Column(String(64), index=True)  # SHA-256 of the uploaded file, see blob_store.py
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     user = relationship("User", back_populates="resumes")
@@ -36,9 +40,17 @@ class Resume(Base):
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (Index("ix_job_descriptions_user_id_id", "user_id", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, index=True)
-    content = Column(Text)
+    content = deferred(Column(Text))  # Raw text; undefer() where it is really needed
+    features = Column(JSON)  # Derived at upload: {"skills": [...]}
+    extractor_version = Column(Integer)  # utils.EXTRACTOR_VERSION used for features
+    embedding = deferred(Column(LargeBinary))  # float16 vector, see embedding_store.py
+    embedding_version = Column(String)
+    embedded_at = Column(DateTime)  # When embedding was last written
+    tfidf_terms = deferred(Column(LargeBinary))  # Hashed term frequencies, see tfidf_index.py
+    content_hash = Column(String(64), index=True)  # SHA-256 of the uploaded file, see blob_store.py
     upload_date = Column(DateTime, default=datetime.utcnow) 
     user_id = Column(Integer, ForeignKey("users.id"))
     # Define relationship
@@ -61,6 +73,11 @@ class User(Base):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # One application per user and job; also serves the user_id lookups
+        UniqueConstraint("user_id", "job_id", name="uq_applications_user_id_job_id"),
+        Index("ix_applications_job_id_id", "job_id", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     job_id = Column(Integer, ForeignKey("job_descriptions.id"), nullable=False)
@@ -75,6 +92,7 @@ class Application(Base):
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (Index("ix_sessions_user_id_is_active_expires_at", "user_id", "is_active", "expires_at"),)
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     token = Column(String, unique=True, index=True, nullable=False)
@@ -87,5 +105,88 @@ class Session(Base):
     user = relationship("User", back_populates="sessions")
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+class IngestJob(Base):
+    # Uploaded document waiting for (or done with) background processing
+    __tablename__ = "ingest_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # "resume" or "job_description"
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    filename = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=True)
+    status = Column(String, default="queued", index=True)  # queued, processing, done, failed
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    result_id = Column(Integer, nullable=True)  # Resume or JobDescription id once done
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ImportRun(Base):
+    # One bulk import from a directory or zip archive, see bulk_import.py
+    __tablename__ = "import_runs"
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # "resume" or "job_description"
+    source = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Owner of the imported rows
+    status = Column(String, default="queued")  # queued, running, done, interrupted, failed
+    total = Column(Integer, default=0)
+    position = Column(Integer, default=0)  # Files handled by committed batches
+    imported = Column(Integer, default=0)
+    cached = Column(Integer, default=0)  # Imported from the parse cache
+    failed = Column(Integer, default=0)
+    errors = Column(JSON)  # [{"file": ..., "error": ...}]
+    error = Column(Text, nullable=True)  # Why the run itself stopped
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class StoredBlob(Base):
+    # One row per distinct uploaded file, see blob_store.py
+    __tablename__ = "blobs"
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer)
+    ref_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ParseCacheEntry(Base):
+    # Parser output for one file content, see parse_cache.py
+    __tablename__ = "parse_cache"
+    __table_args__ = (UniqueConstraint("content_hash", "kind", "extractor_version"),)
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False)
+    kind = Column(String, nullable=False)
+    extractor_version = Column(Integer, nullable=False)
+    result = Column(JSON)  # Column values except tfidf_terms
+    tfidf_terms = Column(LargeBinary)
+    size_bytes = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class RecruiterStats(Base):
+    # Dashboard counters kept in step with jobs and applications, see recruiter_stats.py
+    __tablename__ = "recruiter_stats"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    active_jobs = Column(Integer, nullable=False, default=0)
+    total_applications = Column(Integer, nullable=False, default=0)
+    total_candidates = Column(Integer, nullable=False, default=0)
+
+
+class RecruiterCandidate(Base):
+    # Applications per (recruiter, applicant), so distinct candidates can be counted incrementally
+    __tablename__ = "recruiter_candidates"
+    recruiter_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    applications = Column(Integer, nullable=False, default=0)
+
+
+class TfidfState(Base):
+    # Single row holding corpus document frequencies for tfidf_index
+    __tablename__ = "tfidf_state"
+    id = Column(Integer, primary_key=True)
+    n_docs = Column(Integer, default=0)
+    doc_freq = Column(LargeBinary)  # int32 per hashed feature
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,86 @@
+"""Keyset pagination for the list endpoints.
+
+Every list is ordered by a unique indexed key (the primary key, newest
+first) and a page continues from the key of the last row of the previous
+one, so each page is one index range scan of at most `limit` rows no matter
+how deep into the list it is (unlike OFFSET), and rows inserted meanwhile
+do not shift later pages.
+
+The response body stays a plain list. When there are more rows, the cursor
+for the next page is sent in the X-Next-Cursor header; pass it back as
+?cursor=... . The last page has no header.
+"""
+import base64
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+load_dotenv()
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 100))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 500))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class Page:
+    limit: int = PAGE_SIZE_DEFAULT
+    after: Optional[int] = None
+
+
+def encode_cursor(key: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([key]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (key,) = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(key, int):
+            raise ValueError(key)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def page_params(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(None)
+) -> Page:
+    """?limit=&cursor= as a dependency"""
+    return Page(limit=limit, after=decode_cursor(cursor) if cursor else None)
+
+
+def _page_query(query, key, page: Page):
+    # Works for a Query and for a select() alike
+    if page.after is not None:
+        query = query.filter(key < page.after)
+    return query.order_by(key.desc()).limit(page.limit + 1)
+
+
+def _finish_page(rows: list, key, page: Page, response: Optional[Response]) -> list:
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        if response is not None:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(rows[-1], key.key))
+    return rows
+
+
+def paginate(query, key, page: Page, response: Optional[Response] = None) -> list:
+    """One page of query, newest key first; sets the next cursor on response.
+
+    key is the unique column the list is ordered by. The query must select
+    it (or the entity that has it) under the same name.
+    """
+    return _finish_page(_page_query(query, key, page).all(), key, page, response)
+
+
+async def paginate_async(db: AsyncSession, statement, key, page: Page, response: Optional[Response] = None) -> list:
+    """paginate for a select() on an AsyncSession; returns rows"""
+    rows = (await db.execute(_page_query(statement, key, page))).all()
+    return _finish_page(list(rows), key, page, response)
@@ -0,0 +1,215 @@
+"""Persistent cache of parse results keyed by file content.
+
+Maps (content_hash, kind, EXTRACTOR_VERSION) to the column values the
+parser produced (text, skills, features, TF-IDF terms), so a file that was
+uploaded before is never parsed again, even after the original document is
+deleted. Bumping EXTRACTOR_VERSION misses every old entry; those age out.
+
+The table is bounded to PARSE_CACHE_MAX_MB. Each process keeps a running
+total of the bytes it has stored, recounted from the table every
+PARSE_CACHE_RECOUNT_EVERY stores since other processes write too; once it
+crosses the bound the least recently used entries are evicted down to
+PARSE_CACHE_EVICT_TO of it. Hit/miss counters are kept per process (see
+stats()) and per entry (hits).
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import ParseCacheEntry
+from utils import EXTRACTOR_VERSION
+
+load_dotenv()
+
+PARSE_CACHE_MAX_MB = float(os.getenv("PARSE_CACHE_MAX_MB", 256))
+PARSE_CACHE_RECOUNT_EVERY = int(os.getenv("PARSE_CACHE_RECOUNT_EVERY", 100))
+PARSE_CACHE_EVICT_TO = float(os.getenv("PARSE_CACHE_EVICT_TO", 0.9))  # Fraction of the bound left after evicting
+
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+_size = {"bytes": None, "stores": 0}  # Running total of size_bytes; None until counted
+
+
+def _count(name: str, n: int = 1):
+    with _lock:
+        _counters[name] += n
+
+
+def _max_bytes() -> int:
+    return int(PARSE_CACHE_MAX_MB * 1024 * 1024)
+
+
+def _table_bytes(db: Session) -> int:
+    return db.query(func.sum(ParseCacheEntry.size_bytes)).scalar() or 0
+
+
+def _grown(db: Session, added: int) -> int:
+    """Cache size after storing added bytes, recounted now and then"""
+    with _lock:
+        _size["stores"] += 1
+        if _size["bytes"] is not None and _size["stores"] % PARSE_CACHE_RECOUNT_EVERY:
+            _size["bytes"] += added
+            return _size["bytes"]
+    total = _table_bytes(db)
+    with _lock:
+        _size["bytes"] = total
+    return total
+
+
+def _entry_query(db: Session, kind: str, content_hash: str):
+    return db.query(ParseCacheEntry).filter(
+        ParseCacheEntry.content_hash == content_hash,
+        ParseCacheEntry.kind == kind,
+        ParseCacheEntry.extractor_version == EXTRACTOR_VERSION
+    )
+
+
+def lookup(db: Session, kind: str, content_hash: Optional[str]) -> Optional[dict]:
+    """Cached column values for this file, or None"""
+    if not content_hash:
+        return None
+    entry = _entry_query(db, kind, content_hash).first()
+    if entry is None:
+        _count("misses")
+        return None
+    _count("hits")
+    entry.hits += 1
+    entry.last_used_at = datetime.utcnow()
+    values = dict(entry.result, tfidf_terms=entry.tfidf_terms)
+    db.commit()
+    return values
+
+
+def lookup_many(db: Session, kind: str, content_hashes: Iterable[str]) -> Dict[str, dict]:
+    """lookup for a batch of files; returns {content_hash: values} for the hits"""
+    wanted = list(dict.fromkeys(h for h in content_hashes if h))
+    if not wanted:
+        return {}
+    entries = db.query(ParseCacheEntry).filter(
+        ParseCacheEntry.content_hash.in_(wanted),
+        ParseCacheEntry.kind == kind,
+        ParseCacheEntry.extractor_version == EXTRACTOR_VERSION
+    ).all()
+    now = datetime.utcnow()
+    found = {}
+    for entry in entries:
+        entry.hits += 1
+        entry.last_used_at = now
+        found[entry.content_hash] = dict(entry.result, tfidf_terms=entry.tfidf_terms)
+    db.commit()
+    _count("hits", len(found))
+    _count("misses", len(wanted) - len(found))
+    return found
+
+
+def store(db: Session, kind: str, content_hash: Optional[str], values: dict):
+    """Cache a parse result and evict down to the size bound"""
+    store_many(db, kind, {content_hash: values})
+
+
+def store_many(db: Session, kind: str, results: Dict[str, dict]):
+    """Cache several parse results in one transaction, then evict if over the bound"""
+    now = datetime.utcnow()
+    entries = []
+    for content_hash, values in results.items():
+        if not content_hash:
+            continue
+        fields = {name: value for name, value in values.items() if name != "tfidf_terms"}
+        terms = values.get("tfidf_terms")
+        entries.append(ParseCacheEntry(
+            content_hash=content_hash,
+            kind=kind,
+            extractor_version=EXTRACTOR_VERSION,
+            result=fields,
+            tfidf_terms=terms,
+            size_bytes=len(json.dumps(fields)) + len(terms or b""),
+            hits=0,
+            created_at=now,
+            last_used_at=now
+        ))
+    if not entries:
+        return
+    # Read before committing, which expires the entries
+    sizes = [entry.size_bytes for entry in entries]
+    db.add_all(entries)
+    try:
+        db.commit()
+        stored, added = len(entries), sum(sizes)
+    except IntegrityError:
+        # Some were cached concurrently; fall back to one at a time
+        db.rollback()
+        stored, added = 0, 0
+        for entry, size in zip(entries, sizes):
+            db.add(entry)
+            try:
+                db.commit()
+                stored += 1
+                added += size
+            except IntegrityError:
+                db.rollback()
+    _count("stores", stored)
+    if _grown(db, added) > _max_bytes():
+        evict(db)
+
+
+def evict(db: Session, max_bytes: Optional[int] = None) -> int:
+    """Drop least recently used entries until the cache fits; returns how many.
+
+    Counts the table for real first; when over, evicts down to
+    PARSE_CACHE_EVICT_TO of max_bytes so the next stores do not land here
+    again right away.
+    """
+    if max_bytes is None:
+        max_bytes = _max_bytes()
+    total = _table_bytes(db)
+    if total <= max_bytes:
+        with _lock:
+            _size["bytes"] = total
+        return 0
+    target = int(max_bytes * PARSE_CACHE_EVICT_TO)
+    doomed = []
+    # Oldest first, fetched in pages so the scan stops with the last evicted entry
+    rows = db.execute(select(ParseCacheEntry.id, ParseCacheEntry.size_bytes).order_by(
+        ParseCacheEntry.last_used_at
+    ).execution_options(yield_per=1000))
+    for entry_id, size in rows:
+        doomed.append(entry_id)
+        total -= size or 0
+        if total <= target:
+            break
+    rows.close()
+    for start in range(0, len(doomed), 1000):
+        db.query(ParseCacheEntry).filter(
+            ParseCacheEntry.id.in_(doomed[start:start + 1000])
+        ).delete(synchronize_session=False)
+    db.commit()
+    with _lock:
+        _size["bytes"] = total
+    _count("evictions", len(doomed))
+    return len(doomed)
+
+
+def stats(db: Session) -> dict:
+    entries, size, hits = db.query(
+        func.count(ParseCacheEntry.id),
+        func.sum(ParseCacheEntry.size_bytes),
+        func.sum(ParseCacheEntry.hits)
+    ).one()
+    with _lock:
+        counters = dict(_counters)
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        "entries": entries,
+        "size_mb": round((size or 0) / (1024 * 1024), 3),
+        "max_size_mb": PARSE_CACHE_MAX_MB,
+        "extractor_version": EXTRACTOR_VERSION,
+        "total_entry_hits": hits or 0,
+        "process": dict(counters, hit_rate=round(counters["hits"] / lookups, 3) if lookups else None),
+    }
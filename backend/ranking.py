@@ -0,0 +1,211 @@
+"""Ranking the applicants of one job, in memory or as a streamed export.
+
+Every mode scores each applicant on its own (stored skills, features, term
+vectors or embeddings against the job), so applicants can be scored in
+chunks. GET /rank-candidates/ scores the whole pool at once and returns one
+JSON document. The export (GET /rank-candidates/export) keeps memory
+bounded however many applicants there are:
+
+1. it scores RANKING_EXPORT_CHUNK applications at a time (keyset over
+   Application.id), keeping only their ids and score arrays;
+2. it sorts those arrays;
+3. it fetches the display columns chunk by chunk in rank order, writing
+   NDJSON or CSV lines as it goes.
+"""
+import csv
+import io
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session, undefer
+
+from embedding_store import load_embeddings
+from models import Application, JobDescription, Resume, User
+from scoring import score_applicants, skill_overlap
+from semantic import cosine_scores
+from tfidf_index import decode_terms, get_corpus
+from utils import compare_skills, job_required_skills, parse_stored_skills
+
+load_dotenv()
+
+RANKING_MODES = ("composite", "skills", "text", "semantic")
+EXPORT_FORMATS = ("ndjson", "csv")
+RANKING_EXPORT_CHUNK = int(os.getenv("RANKING_EXPORT_CHUNK", 2000))
+SIGNALS = ("skills", "experience", "education", "text")
+
+# Shown for every candidate; never the documents' content
+DISPLAY_COLUMNS = (
+    Application.id,
+    Application.status,
+    Resume.id.label("resume_id"),
+    Resume.filename,
+    Resume.skills,
+    User.email
+)
+
+
+def scoring_columns(mode: str) -> list:
+    """Columns a mode needs besides the display ones"""
+    columns = []
+    if mode == "composite":
+        columns += [Resume.experience, Resume.education]
+    if mode in ("composite", "text"):
+        columns.append(Resume.tfidf_terms)
+    return columns
+
+
+def applications_query(db: Session, job_id: int, columns):
+    return db.query(*columns).join(Resume, Application.resume_id == Resume.id).outerjoin(
+        User, Application.user_id == User.id
+    ).filter(Application.job_id == job_id)
+
+
+def score_rows(db: Session, mode: str, job: JobDescription, rows, corpus=None,
+               weights: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, Optional[dict]]:
+    """Scores for these application rows, and the per-signal arrays in composite mode.
+
+    corpus is the TF-IDF corpus for the composite and text modes (fetched
+    once by the caller).
+    """
+    if mode == "composite":
+        # Skills, experience, education and text similarity for every applicant at once
+        signals = score_applicants(
+            job.features or {},
+            job.tfidf_terms,
+            [row.skills for row in rows],
+            [row.experience for row in rows],
+            [row.education for row in rows],
+            [row.tfidf_terms for row in rows],
+            corpus,
+            weights=weights
+        )
+        return signals["score"], signals
+    if mode == "semantic":
+        # Documents still waiting for their vectors score 0
+        scores, _ = semantic_scores(db, job, [row.resume_id for row in rows])
+        return (scores if scores is not None else np.zeros(len(rows), dtype=np.float32)), None
+    if mode == "text":
+        # Stored term vectors against the corpus IDF: one sparse product
+        return corpus.scores(
+            decode_terms([job.tfidf_terms]),
+            decode_terms([row.tfidf_terms for row in rows])
+        ), None
+    # Calculate match score (e.g., based on the number of matching skills)
+    return skill_overlap([row.skills for row in rows], job_required_skills(job)), None
+
+
+def semantic_scores(db: Session, job: JobDescription, resume_ids: List[int]) -> Tuple[Optional[np.ndarray], np.ndarray]:
+    """Cosine scores from stored vectors and the mask of resumes that have one.
+
+    Scores are None while the job has no vector yet; resumes without one
+    score 0. Anything missing gets queued for embedding.
+    """
+    job_vector, job_found = load_embeddings(db, JobDescription, [job.id])
+    resume_vectors, found = load_embeddings(db, Resume, resume_ids)
+    if not job_found[0]:
+        return None, found
+    if not found.any():
+        return np.zeros(len(resume_ids), dtype=np.float32), found
+    return cosine_scores(job_vector[0], resume_vectors), found
+
+
+def candidate_entry(row, score: float, job_skills: List[str], breakdown: Optional[dict] = None) -> dict:
+    candidate = {
+        "resume_id": row.resume_id,
+        "filename": row.filename,
+        "applicant_email": row.email or "Unknown",
+        "application_id": row.id,
+        "application_status": row.status,
+        "match_score": float(score),
+        "matching_skills": compare_skills(parse_stored_skills(row.skills), job_skills),
+    }
+    if breakdown is not None:
+        candidate["score_breakdown"] = breakdown
+    return candidate
+
+
+def _score_all(db: Session, mode: str, job: JobDescription, weights) -> Tuple[np.ndarray, np.ndarray, dict]:
+    """(application ids, scores, signals) for every applicant, chunk by chunk"""
+    corpus = get_corpus(db) if mode in ("composite", "text") else None
+    columns = [Application.id, Resume.id.label("resume_id"), Resume.skills] + scoring_columns(mode)
+    ids, scores, signals = [], [], {name: [] for name in SIGNALS}
+    last_id = 0
+    while True:
+        rows = applications_query(db, job.id, columns).filter(
+            Application.id > last_id
+        ).order_by(Application.id).limit(RANKING_EXPORT_CHUNK).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        chunk_scores, chunk_signals = score_rows(db, mode, job, rows, corpus, weights)
+        ids.append(np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows)))
+        scores.append(np.asarray(chunk_scores, dtype=np.float32))
+        if chunk_signals is not None:
+            for name in SIGNALS:
+                signals[name].append(np.asarray(chunk_signals[name], dtype=np.float32))
+    empty = np.zeros(0, dtype=np.float32)
+    return (
+        np.concatenate(ids) if ids else np.zeros(0, dtype=np.int64),
+        np.concatenate(scores) if scores else empty,
+        {name: np.concatenate(parts) for name, parts in signals.items() if parts}
+    )
+
+
+def _csv_header(mode: str) -> List[str]:
+    header = ["rank", "application_id", "resume_id", "filename", "applicant_email",
+              "application_status", "match_score", "matching_skills"]
+    if mode == "composite":
+        header += [f"{name}_score" for name in SIGNALS]
+    return header
+
+
+def _csv_line(rank: int, candidate: dict) -> list:
+    line = [rank, candidate["application_id"], candidate["resume_id"], candidate["filename"],
+            candidate["applicant_email"], candidate["application_status"],
+            round(candidate["match_score"], 6), "; ".join(candidate["matching_skills"])]
+    if "score_breakdown" in candidate:
+        line += [round(candidate["score_breakdown"][name], 6) for name in SIGNALS]
+    return line
+
+
+def export_ranking(db: Session, job_id: int, mode: str = "composite", fmt: str = "ndjson",
+                   weights: Optional[Dict[str, float]] = None) -> Iterator[str]:
+    """The ranking of a job's applicants as NDJSON or CSV text, one chunk of lines at a time"""
+    job = db.query(JobDescription).options(undefer(JobDescription.tfidf_terms)).filter(
+        JobDescription.id == job_id
+    ).first()
+    job_skills = job_required_skills(job)
+    app_ids, scores, signals = _score_all(db, mode, job, weights)
+    order = np.argsort(-scores, kind="stable")
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(_csv_header(mode))
+        yield buffer.getvalue()
+
+    for start in range(0, len(order), RANKING_EXPORT_CHUNK):
+        positions = order[start:start + RANKING_EXPORT_CHUNK]
+        chunk_ids = app_ids[positions].tolist()
+        rows = {row.id: row for row in applications_query(db, job_id, DISPLAY_COLUMNS).filter(
+            Application.id.in_(chunk_ids)
+        )}
+        # Release the chunk's rows (and any read snapshot) before the next one
+        db.commit()
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        for rank, (position, app_id) in enumerate(zip(positions.tolist(), chunk_ids), start=start + 1):
+            row = rows.get(app_id)
+            if row is None:
+                continue  # Withdrawn since it was scored
+            breakdown = {name: float(signals[name][position]) for name in SIGNALS} if signals else None
+            candidate = candidate_entry(row, scores[position], job_skills, breakdown)
+            if writer is not None:
+                writer.writerow(_csv_line(rank, candidate))
+            else:
+                buffer.write(json.dumps(dict(candidate, rank=rank), default=str) + "\n")
+        yield buffer.getvalue()
@@ -0,0 +1,114 @@
+"""Per-recruiter dashboard counters.
+
+recruiter_stats holds one row per recruiter with the numbers shown on the
+dashboard (their jobs, the applications to them and the distinct applicants
+behind those). recruiter_candidates counts applications per (recruiter,
+applicant), which is what lets the distinct count move by +1/-1 as the
+first application arrives or the last one goes.
+
+The helpers here run inside the caller's transaction and never commit, so
+a counter changes together with the row it counts or not at all.
+GET /stats/recruiter is then a primary key lookup. `python reprocess.py
+--recruiter-stats` recomputes everything from the source tables.
+"""
+from typing import Dict
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import Application, JobDescription, RecruiterCandidate, RecruiterStats
+
+
+def _upsert(db: Session, model, key: dict, deltas: Dict[str, int]) -> bool:
+    """Add deltas to a counter row, creating it if needed; True if it was created"""
+    values = {getattr(model, name): getattr(model, name) + delta for name, delta in deltas.items()}
+    where = [getattr(model, name) == value for name, value in key.items()]
+    if db.query(model).filter(*where).update(values, synchronize_session=False):
+        return False
+    try:
+        # Savepoint: losing a race to create the row must not undo the caller's work
+        with db.begin_nested():
+            db.add(model(**key, **deltas))
+        return True
+    except IntegrityError:
+        db.query(model).filter(*where).update(values, synchronize_session=False)
+        return False
+
+
+def _bump(db: Session, recruiter_id: int, **deltas):
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if deltas:
+        _upsert(db, RecruiterStats, {"user_id": recruiter_id}, deltas)
+
+
+def jobs_added(db: Session, recruiter_id: int, n: int = 1):
+    if recruiter_id and n:
+        _bump(db, recruiter_id, active_jobs=n)
+
+
+def application_added(db: Session, recruiter_id: int, applicant_id: int):
+    if not recruiter_id:
+        return
+    created = _upsert(db, RecruiterCandidate, {"recruiter_id": recruiter_id, "user_id": applicant_id}, {"applications": 1})
+    _bump(db, recruiter_id, total_applications=1, total_candidates=int(created))
+
+
+def job_removed(db: Session, job_id: int, recruiter_id: int):
+    """Before deleting a job: drop it and the applications to it from the counters"""
+    if not recruiter_id:
+        return
+    per_applicant = db.query(Application.user_id, func.count(Application.id)).filter(
+        Application.job_id == job_id
+    ).group_by(Application.user_id).all()
+    gone = 0
+    for applicant_id, n in per_applicant:
+        db.query(RecruiterCandidate).filter(
+            RecruiterCandidate.recruiter_id == recruiter_id,
+            RecruiterCandidate.user_id == applicant_id
+        ).update({RecruiterCandidate.applications: RecruiterCandidate.applications - n}, synchronize_session=False)
+        gone += db.query(RecruiterCandidate).filter(
+            RecruiterCandidate.recruiter_id == recruiter_id,
+            RecruiterCandidate.user_id == applicant_id,
+            RecruiterCandidate.applications <= 0
+        ).delete(synchronize_session=False)
+    _bump(db, recruiter_id, active_jobs=-1,
+          total_applications=-sum(n for _, n in per_applicant), total_candidates=-gone)
+
+
+def get_stats(db: Session, recruiter_id: int) -> dict:
+    row = db.query(
+        RecruiterStats.total_candidates, RecruiterStats.active_jobs, RecruiterStats.total_applications
+    ).filter(RecruiterStats.user_id == recruiter_id).first()
+    if row is None:
+        return {"total_candidates": 0, "active_jobs": 0, "total_applications": 0}
+    return {
+        "total_candidates": row.total_candidates,
+        "active_jobs": row.active_jobs,
+        "total_applications": row.total_applications
+    }
+
+
+def rebuild(db):
+    """Recompute every counter from jobs and applications (Session or Connection; caller commits)"""
+    db.execute(delete(RecruiterCandidate))
+    db.execute(delete(RecruiterStats))
+    db.execute(insert(RecruiterCandidate).from_select(
+        ["recruiter_id", "user_id", "applications"],
+        select(JobDescription.user_id, Application.user_id, func.count(Application.id)).join(
+            JobDescription, Application.job_id == JobDescription.id
+        ).where(JobDescription.user_id.isnot(None)).group_by(JobDescription.user_id, Application.user_id)
+    ))
+    # Applications only count through a job, so every recruiter with any has a job
+    candidates = select(RecruiterCandidate.recruiter_id, func.count().label("n"),
+                        func.sum(RecruiterCandidate.applications).label("applications")).group_by(
+        RecruiterCandidate.recruiter_id
+    ).subquery()
+    jobs = select(JobDescription.user_id, func.count(JobDescription.id).label("n")).where(
+        JobDescription.user_id.isnot(None)
+    ).group_by(JobDescription.user_id).subquery()
+    db.execute(insert(RecruiterStats).from_select(
+        ["user_id", "active_jobs", "total_applications", "total_candidates"],
+        select(jobs.c.user_id, jobs.c.n, func.coalesce(candidates.c.applications, 0),
+               func.coalesce(candidates.c.n, 0)).outerjoin(candidates, candidates.c.recruiter_id == jobs.c.user_id)
+    ))
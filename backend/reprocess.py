@@ -0,0 +1,124 @@
+"""Re-extract stored document features after extraction logic changes.
+
+Ranking and the job board only read the features stored at upload time, so
+when extract_resume_info / extract_job_description_features (or the skills
+taxonomy) change, bump utils.EXTRACTOR_VERSION and run:
+
+    python reprocess.py                # rows extracted with an older version
+    python reprocess.py --all          # every row
+    python reprocess.py --embeddings   # also re-embed rows with a stale EMBEDDING_VERSION
+    python reprocess.py --tfidf        # store missing TF-IDF term vectors and refresh the IDF
+    python reprocess.py --recruiter-stats  # recompute the recruiter dashboard counters
+"""
+import argparse
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, undefer
+
+from database import SessionLocal
+from models import JobDescription, Resume
+from utils import EXTRACTOR_VERSION, extract_job_description_features, extract_resume_info
+
+
+def _stale(model, force: bool):
+    if force:
+        return True
+    return or_(model.extractor_version.is_(None), model.extractor_version != EXTRACTOR_VERSION)
+
+
+def _stale_ids(db: Session, model, force: bool):
+    return [row.id for row in db.query(model.id).filter(_stale(model, force)).order_by(model.id)]
+
+
+def reprocess_resumes(db: Session, force: bool = False, batch_size: int = 200):
+    """Recompute skills, experience and education for stale resumes"""
+    ids = _stale_ids(db, Resume, force)
+    for start in range(0, len(ids), batch_size):
+        batch = db.query(Resume).options(undefer(Resume.content)).filter(Resume.id.in_(ids[start:start + batch_size])).all()
+        for resume in batch:
+            skills, experience, education = extract_resume_info(resume.content or "")
+            resume.skills = ", ".join(skills)
+            resume.experience = experience
+            resume.education = education
+            resume.extractor_version = EXTRACTOR_VERSION
+        db.commit()
+        db.expunge_all()
+    return len(ids)
+
+
+def reprocess_job_descriptions(db: Session, force: bool = False, batch_size: int = 200):
+    """Recompute stored features for stale job descriptions"""
+    ids = _stale_ids(db, JobDescription, force)
+    for start in range(0, len(ids), batch_size):
+        batch = db.query(JobDescription).options(undefer(JobDescription.content)).filter(JobDescription.id.in_(ids[start:start + batch_size])).all()
+        for job in batch:
+            job.features = extract_job_description_features(job.content or "")
+            job.extractor_version = EXTRACTOR_VERSION
+        db.commit()
+        db.expunge_all()
+    return len(ids)
+
+
+def reembed_documents(db: Session, model, batch_size: int = 64):
+    """Re-embed rows whose stored vector predates embedding_store.EMBEDDING_VERSION"""
+    from embedding_store import embed_documents, stale_embedding_ids
+
+    ids = stale_embedding_ids(db, model)
+    for start in range(0, len(ids), batch_size):
+        embed_documents(db, model, ids[start:start + batch_size])
+        db.expunge_all()
+    return len(ids)
+
+
+def backfill_tfidf_terms(db: Session, model, batch_size: int = 500):
+    """Store term vectors for rows uploaded before tfidf_index existed"""
+    from tfidf_index import encode_terms, term_frequencies
+
+    ids = [row.id for row in db.query(model.id).filter(model.tfidf_terms.is_(None)).order_by(model.id)]
+    for start in range(0, len(ids), batch_size):
+        rows = db.query(model.id, model.content).filter(model.id.in_(ids[start:start + batch_size])).all()
+        terms = term_frequencies([row.content for row in rows])
+        db.bulk_update_mappings(model, [
+            {"id": row.id, "tfidf_terms": encode_terms(terms[i])} for i, row in enumerate(rows)
+        ])
+        db.commit()
+    return len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--all", action="store_true", help="reprocess every row, not only stale ones")
+    parser.add_argument("--embeddings", action="store_true", help="re-embed documents with stale vectors")
+    parser.add_argument("--tfidf", action="store_true", help="backfill TF-IDF term vectors and refresh the IDF")
+    parser.add_argument("--recruiter-stats", action="store_true", help="recompute the recruiter dashboard counters")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        resumes = reprocess_resumes(db, force=args.all, batch_size=args.batch_size)
+        jobs = reprocess_job_descriptions(db, force=args.all, batch_size=args.batch_size)
+        print(f"Reprocessed {resumes} resumes and {jobs} job descriptions (extractor v{EXTRACTOR_VERSION})")
+        if args.embeddings:
+            resumes = reembed_documents(db, Resume)
+            jobs = reembed_documents(db, JobDescription)
+            print(f"Re-embedded {resumes} resumes and {jobs} job descriptions")
+        if args.tfidf:
+            from tfidf_index import refresh_corpus
+
+            resumes = backfill_tfidf_terms(db, Resume)
+            jobs = backfill_tfidf_terms(db, JobDescription)
+            corpus = refresh_corpus(db)
+            print(f"Stored term vectors for {resumes} resumes and {jobs} job descriptions; IDF over {corpus.n_docs} documents")
+        if args.recruiter_stats:
+            import recruiter_stats
+
+            recruiter_stats.rebuild(db)
+            db.commit()
+            print("Recomputed the recruiter dashboard counters")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Vectorized composite scoring of a whole applicant pool against one job.
+
+Every signal is computed as a NumPy array over all applicants from the
+features stored at upload (skills, experience, education, TF-IDF terms) and
+combined with utils.calculate_match_score.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from tfidf_index import CorpusTfidf, decode_terms
+from utils import EDUCATION_LEVELS, calculate_match_score
+
+_EXPERIENCE_SUFFIX = " years of experience"
+_EDUCATION_SUFFIX = " degree found"
+
+
+def skill_overlap(skills_column: Sequence[Optional[str]], job_skills: List[str]) -> np.ndarray:
+    """Fraction of the job's skills found in each stored skills string"""
+    if not job_skills:
+        return np.zeros(len(skills_column), dtype=np.float32)
+    wanted = set(job_skills)
+    counts = np.fromiter(
+        (len(wanted.intersection(skills.split(", "))) if skills else 0 for skills in skills_column),
+        dtype=np.float32,
+        count=len(skills_column)
+    )
+    return counts / len(wanted)
+
+
+def _parse_column(column: Sequence[Optional[str]], parse) -> np.ndarray:
+    # These columns hold a handful of distinct strings; parse each one once
+    parsed = {value: parse(value) for value in set(column)}
+    return np.fromiter(map(parsed.__getitem__, column), dtype=np.float32, count=len(column))
+
+
+def _parse_years(value: Optional[str]) -> float:
+    if value and value.endswith(_EXPERIENCE_SUFFIX):
+        return float(value[:-len(_EXPERIENCE_SUFFIX)])
+    return np.nan
+
+
+def _parse_education(value: Optional[str]) -> float:
+    if value and value.endswith(_EDUCATION_SUFFIX):
+        return EDUCATION_LEVELS.get(value[:-len(_EDUCATION_SUFFIX)], 0)
+    return 0
+
+
+def experience_years(experience_column: Sequence[Optional[str]]) -> np.ndarray:
+    """Years parsed from "N years of experience"; NaN when not specified"""
+    return _parse_column(experience_column, _parse_years)
+
+
+def education_levels(education_column: Sequence[Optional[str]]) -> np.ndarray:
+    """Ordinal level parsed from "<keyword> degree found"; 0 when not specified"""
+    return _parse_column(education_column, _parse_education)
+
+
+def experience_fit(years: np.ndarray, required: Optional[int]) -> np.ndarray:
+    if not required:
+        return np.ones_like(years)
+    return np.clip(np.nan_to_num(years, nan=0.0) / required, 0.0, 1.0)
+
+
+def education_fit(levels: np.ndarray, required: int) -> np.ndarray:
+    if not required:
+        return np.ones_like(levels)
+    return np.clip(levels / required, 0.0, 1.0)
+
+
+def score_applicants(
+    job_features: dict,
+    job_terms: Optional[bytes],
+    skills: Sequence[Optional[str]],
+    experience: Sequence[Optional[str]],
+    education: Sequence[Optional[str]],
+    terms: Sequence[Optional[bytes]],
+    corpus: CorpusTfidf,
+    weights: Optional[Dict[str, float]] = None
+) -> Dict[str, np.ndarray]:
+    """Per-signal arrays and the combined "score" array, one entry per applicant"""
+    signals = {
+        "skills": skill_overlap(skills, job_features.get("skills", [])),
+        "experience": experience_fit(experience_years(experience), job_features.get("min_experience_years")),
+        "education": education_fit(education_levels(education), job_features.get("education_level", 0)),
+        "text": corpus.scores(decode_terms([job_terms]), decode_terms(list(terms))),
+    }
+    signals["score"] = calculate_match_score(
+        signals["skills"], signals["experience"], signals["education"], signals["text"], weights=weights
+    )
+    return signals
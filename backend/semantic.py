@@ -0,0 +1,64 @@
+"""Batched sentence embeddings and vectorized cosine scoring.
+
+Texts are embedded with the registry's "embedding" model in CPU batches and
+mean-pooled over the attention mask, giving one L2-normalised vector per text.
+"""
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+from model_registry import registry
+
+load_dotenv()
+
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 16))
+EMBEDDING_MAX_LENGTH = int(os.getenv("EMBEDDING_MAX_LENGTH", 512))
+
+
+def embed_texts(texts: Sequence[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """Embed texts into an (n, dim) float32 array of unit vectors"""
+    import torch
+
+    tokenizer, model = registry.get("embedding")
+    batch_size = batch_size or EMBEDDING_BATCH_SIZE
+
+    dim = model.config.hidden_size
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    if not len(texts):
+        return vectors
+
+    # Batch texts of similar length together to keep padding small
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            encoded = tokenizer(
+                [texts[i] or "" for i in idx],
+                padding=True,
+                truncation=True,
+                max_length=EMBEDDING_MAX_LENGTH,
+                return_tensors="pt"
+            )
+            hidden = model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            vectors[idx] = pooled.numpy()
+
+    return normalize(vectors)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def cosine_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine similarity of one query vector against every row of matrix"""
+    if not len(matrix):
+        return np.zeros(0, dtype=np.float32)
+    query = normalize(np.asarray(query, dtype=np.float32))
+    matrix = normalize(np.asarray(matrix, dtype=np.float32))
+    return matrix @ query
+
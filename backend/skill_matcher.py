@@ -0,0 +1,106 @@
+import json
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every skill name and alias in a taxonomy.
+
+    The text is scanned once, whatever the taxonomy size. A match only counts
+    when it sits on word boundaries, so "Go" does not fire inside "Google" and
+    "Java" does not fire inside "JavaScript".
+    """
+
+    def __init__(self, taxonomy: Iterable[Tuple[str, Iterable[str]]]):
+        # State 0 is the root. Each state has a transition table, a failure
+        # link and the (pattern length, canonical skill) pairs ending there.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        self.skills: List[str] = []
+
+        for canonical, aliases in taxonomy:
+            self.skills.append(canonical)
+            for term in {canonical, *aliases}:
+                self._add(term.lower(), canonical)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add(self, term: str, canonical: str):
+        if not term:
+            return
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state].append((len(term), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def find(self, text: str) -> List[str]:
+        """Return canonical skills found in text, in order of first appearance"""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        size = len(text)
+        found: Dict[str, None] = {}
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for length, canonical in out[state]:
+                if canonical in found:
+                    continue
+                start = end - length + 1
+                if _is_word_char(text[start]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(ch) and end + 1 < size and _is_word_char(text[end + 1]):
+                    continue
+                found[canonical] = None
+        return list(found)
+
+
+def load_taxonomy(path: str) -> List[Tuple[str, List[str]]]:
+    """Load a skills taxonomy JSON file.
+
+    The file holds {"skills": [{"name": "Kubernetes", "aliases": ["k8s"]}, ...]}.
+    A bare list of names is accepted as well.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data["skills"] if isinstance(data, dict) else data
+    taxonomy = []
+    for entry in entries:
+        if isinstance(entry, str):
+            taxonomy.append((entry, []))
+        else:
+            taxonomy.append((entry["name"], list(entry.get("aliases", []))))
+    return taxonomy
+
+
+def load_skill_matcher(path: str) -> SkillMatcher:
+    return SkillMatcher(load_taxonomy(path))
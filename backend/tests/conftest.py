@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# One in-memory database shared by the sync and async engines (cache=shared),
+# set before anything imports database.py
+os.environ["DATABASE_URL"] = "sqlite:///file:resume_screener_tests?mode=memory&cache=shared&uri=true"
+os.environ["INGEST_IN_PROCESS"] = "false"
+os.environ["SEMANTIC_FEATURES_ENABLED"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# main.py creates uploads/ (and the blob store its directories) in the working directory
+os.chdir(tempfile.mkdtemp())
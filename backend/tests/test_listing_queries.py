@@ -0,0 +1,109 @@
+"""The listing endpoints and ranking issue the same statements whatever the result size"""
+import asyncio
+
+import pytest
+from fastapi import Response
+from sqlalchemy import event
+
+import main as api
+from database import AsyncSessionLocal, SessionLocal, async_engine, engine
+from models import Application, JobDescription, Resume, User
+from pagination import PAGE_SIZE_MAX, Page
+
+N = 20
+SIZES = (N, 10 * N)
+
+
+def seed(db, n: int):
+    """n postings; one applicant applies to all of them, n - 1 more to the first one"""
+    recruiter = User(email=f"recruiter{n}@example.com", hashed_password="x", role="recruiter")
+    db.add(recruiter)
+    db.flush()
+    jobs = [JobDescription(filename=f"job_{n}_{j}.txt", content="Python", features={"skills": ["Python"]},
+                           user_id=recruiter.id) for j in range(n)]
+    db.add_all(jobs)
+    db.flush()
+    applicants = []
+    for i in range(n):
+        applicant = User(email=f"applicant{n}_{i}@example.com", hashed_password="x", role="applicant")
+        db.add(applicant)
+        db.flush()
+        resume = Resume(filename=f"resume_{i}.txt", content="Python developer", skills="Python, Docker",
+                        experience="3 years of experience", education="Bachelor degree found", user_id=applicant.id)
+        db.add(resume)
+        db.flush()
+        applicants.append((applicant, resume))
+    applicant, resume = applicants[0]
+    db.add_all(Application(user_id=applicant.id, job_id=job.id, resume_id=resume.id) for job in jobs)
+    db.add_all(Application(user_id=other.id, job_id=jobs[0].id, resume_id=other_resume.id)
+               for other, other_resume in applicants[1:])
+    db.commit()
+    # Loaded and detached, so using them as current_user issues no statements
+    for user in (recruiter, applicant):
+        db.refresh(user)
+    db.refresh(jobs[0])
+    db.expunge_all()
+    return recruiter, jobs[0], applicant
+
+
+async def with_async_db(endpoint, *args, **kwargs):
+    async with AsyncSessionLocal() as db:
+        return await endpoint(*args, db=db, **kwargs)
+
+
+def rank(job, recruiter):
+    db = SessionLocal()
+    try:
+        return api.rank_candidates(job.id, mode="skills", weights=None, db=db,
+                                   current_user=recruiter)["ranked_candidates"]
+    finally:
+        db.close()
+
+
+ENDPOINTS = {
+    # name: (rows expected for n, call)
+    "/recruiter/applications": (lambda n: 2 * n - 1, lambda recruiter, job, applicant: asyncio.run(with_async_db(
+        api.get_recruiter_applications, Response(), Page(PAGE_SIZE_MAX), current_user=recruiter))),
+    "/recruiter/applications/{job_id}": (lambda n: n, lambda recruiter, job, applicant: asyncio.run(with_async_db(
+        api.get_job_applications, job.id, Response(), Page(PAGE_SIZE_MAX), current_user=recruiter))),
+    "/applications": (lambda n: n, lambda recruiter, job, applicant: asyncio.run(with_async_db(
+        api.get_user_applications, Response(), Page(PAGE_SIZE_MAX), current_user=applicant))),
+    "/rank-candidates/": (lambda n: n, lambda recruiter, job, applicant: rank(job, recruiter)),
+}
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    assert 2 * max(SIZES) - 1 <= PAGE_SIZE_MAX, "every listing has to fit on one page"
+    db = SessionLocal()
+    try:
+        return {n: seed(db, n) for n in SIZES}
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def statements():
+    seen = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    targets = (engine, async_engine.sync_engine)
+    for target in targets:
+        event.listen(target, "before_cursor_execute", count)
+    yield seen
+    for target in targets:
+        event.remove(target, "before_cursor_execute", count)
+
+
+@pytest.mark.parametrize("endpoint", list(ENDPOINTS))
+def test_query_count_does_not_depend_on_result_size(endpoint, seeded, statements):
+    expected_rows, call = ENDPOINTS[endpoint]
+    counts = {}
+    for n, (recruiter, job, applicant) in seeded.items():
+        statements.clear()
+        rows = call(recruiter, job, applicant)
+        counts[n] = len(statements)
+        assert len(rows) == expected_rows(n)
+    assert counts[N] == counts[10 * N], f"{endpoint}: {counts}"
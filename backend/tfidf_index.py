@@ -0,0 +1,229 @@
+"""Corpus-level TF-IDF shared by every resume and job description.
+
+Terms are hashed into a fixed feature space, so the vocabulary never has to be
+refitted. Each document's sublinear term frequencies are computed once at
+upload and stored on its row (tfidf_terms). IDF weights are applied at query
+time from document frequencies over the whole corpus, so refreshing the IDF
+never rewrites stored vectors.
+
+Document frequencies live in the single-row tfidf_state table. Each process
+caches them and folds in the documents it uploads. Once the state is older
+than TFIDF_REFRESH_SECONDS, a background thread recomputes it from the stored
+vectors (or picks up a newer state saved by another process) while requests
+keep using the cached one.
+"""
+import os
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+from dotenv import load_dotenv
+from sklearn.feature_extraction.text import HashingVectorizer
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import JobDescription, Resume, TfidfState
+
+load_dotenv()
+
+TFIDF_N_FEATURES = 2 ** 18
+TFIDF_REFRESH_SECONDS = int(os.getenv("TFIDF_REFRESH_SECONDS", 3600))
+
+_vectorizer = HashingVectorizer(
+    n_features=TFIDF_N_FEATURES,
+    alternate_sign=False,
+    norm=None,
+    stop_words="english",
+    dtype=np.float32
+)
+
+
+def term_frequencies(texts: Iterable[str]) -> sp.csr_matrix:
+    """Sublinear (1 + log tf) hashed term frequencies, one row per text"""
+    tf = _vectorizer.transform([text or "" for text in texts]).tocsr()
+    tf.data = 1 + np.log(tf.data)
+    return tf
+
+
+# First byte of a packed row. Rows stored before it existed have no marker
+# (len % 8 == 0) and hold all their indices followed by all their values.
+TERMS_FORMAT = 2
+
+
+def encode_terms(row: sp.csr_matrix) -> bytes:
+    """Pack one sparse row as TERMS_FORMAT then interleaved (int32 index, float32 value) pairs"""
+    pairs = np.empty((row.nnz, 2), dtype=np.int32)
+    pairs[:, 0] = row.indices
+    pairs[:, 1] = row.data.astype(np.float32).view(np.int32)
+    return bytes([TERMS_FORMAT]) + pairs.tobytes()
+
+
+def _pairs(blob: bytes):
+    """The interleaved pairs of one stored row, whatever format it was stored in"""
+    if len(blob) % 8 == 1 and blob[0] == TERMS_FORMAT:
+        return blob[1:]
+    if len(blob) % 8:
+        raise ValueError(f"Unknown tfidf_terms format ({len(blob)} bytes)")
+    n = len(blob) // 8
+    pairs = np.empty((n, 2), dtype=np.int32)
+    pairs[:, 0] = np.frombuffer(blob, dtype=np.int32, count=n)
+    pairs[:, 1] = np.frombuffer(blob, dtype=np.int32, offset=4 * n)
+    return pairs.tobytes()
+
+
+def decode_terms(blobs: List[Optional[bytes]]) -> sp.csr_matrix:
+    """Stack stored rows into an (n, TFIDF_N_FEATURES) matrix; missing rows are empty"""
+    lengths = np.array([len(blob) // 8 if blob else 0 for blob in blobs], dtype=np.int64)
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    present = [blob for blob in blobs if blob]
+    if all(len(blob) % 8 == 1 and blob[0] == TERMS_FORMAT for blob in present):
+        joined = b"".join([blob[1:] for blob in present])
+    else:
+        joined = b"".join([_pairs(blob) for blob in present])
+    pairs = np.frombuffer(joined, dtype=np.int32).reshape(-1, 2)
+    indices = pairs[:, 0].copy()
+    data = pairs[:, 1].view(np.float32).copy()
+    return sp.csr_matrix((data, indices, indptr), shape=(len(blobs), TFIDF_N_FEATURES))
+
+
+class CorpusTfidf:
+    def __init__(self, doc_freq: Optional[np.ndarray] = None, n_docs: int = 0,
+                 refreshed_at: Optional[float] = None):
+        self.doc_freq = np.zeros(TFIDF_N_FEATURES, dtype=np.int32) if doc_freq is None else doc_freq
+        self.n_docs = n_docs
+        # When these frequencies were computed (epoch seconds), not when loaded
+        self.refreshed_at = time.time() if refreshed_at is None else refreshed_at
+        self._idf_squared = None
+
+    @classmethod
+    def from_state(cls, state: TfidfState) -> "CorpusTfidf":
+        return cls(np.frombuffer(state.doc_freq, dtype=np.int32).copy(), state.n_docs,
+                   state.refreshed_at.replace(tzinfo=timezone.utc).timestamp())
+
+    def is_stale(self) -> bool:
+        return time.time() - self.refreshed_at >= TFIDF_REFRESH_SECONDS
+
+    @property
+    def idf(self) -> np.ndarray:
+        # Smoothed IDF, as in sklearn's TfidfTransformer
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq.astype(np.float32))) + 1
+
+    def _weights(self) -> np.ndarray:
+        if self._idf_squared is None:
+            self._idf_squared = (self.idf ** 2).astype(np.float32)
+        return self._idf_squared
+
+    def add_documents(self, tf: sp.csr_matrix):
+        """Fold new documents into the document frequencies"""
+        np.add.at(self.doc_freq, tf.indices, 1)
+        self.n_docs += tf.shape[0]
+        self._idf_squared = None
+
+    def scores(self, query_tf: sp.csr_matrix, docs_tf: sp.csr_matrix) -> np.ndarray:
+        """Cosine similarity of TF-IDF vectors, query against every document row"""
+        if docs_tf.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+        idf_squared = self._weights()
+        query = query_tf.toarray().ravel()
+        query_norm = np.sqrt(np.dot(query * query, idf_squared))
+        dots = docs_tf @ (query * idf_squared)
+        doc_norms = np.sqrt(docs_tf.multiply(docs_tf) @ idf_squared)
+        return (dots / np.maximum(doc_norms * query_norm, 1e-12)).astype(np.float32)
+
+    def save(self, db: Session):
+        state = db.query(TfidfState).filter(TfidfState.id == 1).first() or TfidfState(id=1)
+        state.n_docs = self.n_docs
+        state.doc_freq = self.doc_freq.tobytes()
+        state.refreshed_at = datetime.fromtimestamp(self.refreshed_at, timezone.utc).replace(tzinfo=None)
+        db.merge(state)
+        db.commit()
+
+
+def compute_corpus(db: Session, batch_size: int = 5000) -> CorpusTfidf:
+    """Recompute document frequencies from every stored term vector"""
+    corpus = CorpusTfidf()
+    for model in (Resume, JobDescription):
+        query = db.query(model.tfidf_terms).filter(model.tfidf_terms.isnot(None))
+        batch = []
+        for row in query.execution_options(yield_per=batch_size):
+            batch.append(row.tfidf_terms)
+            if len(batch) == batch_size:
+                corpus.add_documents(decode_terms(batch))
+                batch = []
+        if batch:
+            corpus.add_documents(decode_terms(batch))
+    return corpus
+
+
+_lock = threading.Lock()
+_corpus: Optional[CorpusTfidf] = None
+_refreshing = threading.Event()
+
+
+def _load_state(db: Session) -> Optional[CorpusTfidf]:
+    state = db.query(TfidfState).filter(TfidfState.id == 1).first()
+    return CorpusTfidf.from_state(state) if state is not None and state.doc_freq else None
+
+
+def _refresh_in_background():
+    """Swap in a fresh corpus: another process' newer state, or a recompute"""
+    global _corpus
+    db = SessionLocal()
+    try:
+        corpus = _load_state(db)
+        if corpus is None or corpus.is_stale():
+            corpus = compute_corpus(db)
+            corpus.save(db)
+        with _lock:
+            _corpus = corpus
+    except Exception:
+        traceback.print_exc()
+    finally:
+        db.close()
+        _refreshing.clear()
+
+
+def get_corpus(db: Session) -> CorpusTfidf:
+    """Cached corpus statistics; a stale state is refreshed in the background"""
+    global _corpus
+    with _lock:
+        if _corpus is None:
+            # First use: the stored state, even if stale; compute only if there is none
+            _corpus = _load_state(db)
+            if _corpus is None:
+                _corpus = compute_corpus(db)
+                _corpus.save(db)
+        corpus = _corpus
+        refresh = corpus.is_stale() and not _refreshing.is_set()
+        if refresh:
+            _refreshing.set()
+    if refresh:
+        threading.Thread(target=_refresh_in_background, name="tfidf-refresh", daemon=True).start()
+    return corpus
+
+
+def refresh_corpus(db: Session) -> CorpusTfidf:
+    """Force an IDF refresh from the stored vectors"""
+    global _corpus
+    with _lock:
+        _corpus = compute_corpus(db)
+        _corpus.save(db)
+        return _corpus
+
+
+def observe_document(tf: sp.csr_matrix):
+    """Count an uploaded document in this process' IDF until the next refresh"""
+    with _lock:
+        if _corpus is not None:
+            _corpus.add_documents(tf)
+
+
+def text_similarity(text_a: str, text_b: str) -> float:
+    """TF-IDF cosine similarity of two texts using the cached corpus IDF"""
+    tf = term_frequencies([text_a, text_b])
+    corpus = _corpus or CorpusTfidf()
+    return float(corpus.scores(tf[1], tf[0:1])[0])
@@ -0,0 +1,120 @@
+"""Streaming uploads to disk in fixed-size chunks.
+
+Uploads are copied chunk by chunk with non-blocking file I/O and hashed on
+the way, so memory per upload is one chunk whatever the file size. Each file
+type has its own size cap (UPLOAD_MAX_MB); an upload over the cap is rejected
+with 413 as soon as it is known to be too big and the partial file is removed.
+
+Starlette spools the whole multipart body before an endpoint runs, so the
+per-file check only happens after the upload has been received.
+UploadSizeLimitMiddleware turns requests away before that, from their
+Content-Length, when the body is bigger than any upload to that path may
+be. A chunked request (no Content-Length) is still read in full first.
+"""
+import hashlib
+import os
+from typing import Optional, Tuple
+
+import anyio
+from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+
+load_dotenv()
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+DEFAULT_UPLOAD_MAX_MB = {
+    "pdf": 20,
+    "docx": 10,
+    "txt": 2,
+    "jpg": 5,
+    "jpeg": 5,
+    "png": 5,
+    "gif": 5,
+    "zip": 1024,  # Bulk imports
+}
+UPLOAD_MAX_MB_OTHER = float(os.getenv("UPLOAD_MAX_MB_OTHER", 5))
+# Room for the multipart boundaries, part headers and other form fields
+MULTIPART_OVERHEAD = 64 * 1024
+# Paths that take zip archives (or sets of files) instead of one document
+BULK_UPLOAD_PREFIX = "/bulk-imports/"
+
+
+def parse_upload_limits(spec: Optional[str]):
+    """Parse "extension=megabytes,..." on top of the defaults"""
+    limits = dict(DEFAULT_UPLOAD_MAX_MB)
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        extension, _, value = part.partition("=")
+        limits[extension.strip().lower().lstrip(".")] = float(value)
+    return limits
+
+UPLOAD_MAX_MB = parse_upload_limits(os.getenv("UPLOAD_MAX_MB"))
+
+
+def max_upload_bytes(filename: str) -> int:
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    return int(UPLOAD_MAX_MB.get(extension, UPLOAD_MAX_MB_OTHER) * 1024 * 1024)
+
+
+def max_request_bytes(path: str) -> int:
+    """Largest request body that can be a valid upload to path"""
+    if path.startswith(BULK_UPLOAD_PREFIX):
+        largest = max_upload_bytes("import.zip")
+    else:
+        largest = max(max_upload_bytes(f"file.{extension}") for extension in UPLOAD_MAX_MB if extension != "zip")
+        largest = max(largest, max_upload_bytes("file"))
+    return largest + MULTIPART_OVERHEAD
+
+
+class UploadSizeLimitMiddleware:
+    """413 for a request whose Content-Length is over max_request_bytes, before the body is read"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            length = dict(scope["headers"]).get(b"content-length", b"")
+            limit = max_request_bytes(scope["path"])
+            if length.isdigit() and int(length) > limit:
+                response = JSONResponse(
+                    {"detail": f"Request body is larger than the {(limit - MULTIPART_OVERHEAD) / (1024 * 1024):g} MB limit for uploads"},
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def _too_large(filename: str, limit: int):
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"{filename} is larger than the {limit / (1024 * 1024):g} MB limit for this file type"
+    )
+
+
+async def stream_upload(file: UploadFile, file_location: str) -> Tuple[int, str]:
+    """Copy an upload to file_location; returns (size in bytes, sha256 hex)"""
+    limit = max_upload_bytes(file.filename)
+    # The multipart parser usually knows the size already
+    if file.size is not None and file.size > limit:
+        raise _too_large(file.filename, limit)
+
+    digest = hashlib.sha256()
+    size = 0
+    partial = file_location + ".part"
+    try:
+        async with await anyio.open_file(partial, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > limit:
+                    raise _too_large(file.filename, limit)
+                digest.update(chunk)
+                await buffer.write(chunk)
+        await anyio.Path(partial).replace(file_location)
+    except BaseException:
+        await anyio.Path(partial).unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
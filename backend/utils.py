@@ -1,14 +1,17 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
+import re
 from typing import Optional
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from transformers import pipeline
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
 
-from database import get_db
+from database import get_async_db, get_db
 from models import User
 from schemas import TokenData
+from skill_matcher import SkillMatcher, load_skill_matcher
+from tfidf_index import text_similarity
 
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -31,52 +34,59 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
-# Load a pretrained NLP model
-nlp = pipeline("feature-extraction", model="bert-base-uncased")
-
-# Comprehensive list of common technical skills
-TECH_SKILLS = [
-    # Programming Languages
-    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust", "Ruby", "PHP", "Swift", "Kotlin", "Scala", "R",
-    # Web Frameworks
-    "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring", "Rails", "Laravel", "Next.js",
-    # Databases
-    "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Oracle", "SQLite", "Cassandra", "DynamoDB",
-    # Cloud & DevOps
-    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "CI/CD", "Terraform", "Ansible", "Linux", "Git", "GitHub",
-    # Data Science & ML
-    "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn", "NLP", "Computer Vision",
-    # Soft Skills & Misc
-    "Agile", "Scrum", "REST API", "GraphQL", "Microservices", "Unit Testing", "TDD", "Leadership", "Communication"
-]
+# Bump whenever extraction logic or the taxonomy changes so that
+# `python reprocess.py` re-extracts the stored features.
+EXTRACTOR_VERSION = 2
+
+# Skills taxonomy (canonical names plus aliases). Point SKILL_TAXONOMY_PATH at a
+# larger file to extend it; the matcher cost does not grow with its size.
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills.json")
+)
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Build the skill automaton once per process"""
+    return load_skill_matcher(SKILL_TAXONOMY_PATH)
 
 def extract_skills(text: str):
-    """Extract skills from text by matching against known skills list"""
+    """Extract skills from text by matching against the skills taxonomy"""
+    return get_skill_matcher().find(text)
+
+# Experience and education patterns shared by resume and job extraction
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\+?\s*years?\s*(of)?\s*(experience|working)?')
+EDUCATION_KEYWORDS = ["Bachelor", "Master", "PhD", "B.S.", "M.S.", "B.A.", "M.A.", "MBA", "Degree"]
+# Ordinal level of each keyword, used to compare candidates with requirements
+EDUCATION_LEVELS = {
+    "Degree": 1,
+    "Bachelor": 2, "B.S.": 2, "B.A.": 2,
+    "Master": 3, "M.S.": 3, "M.A.": 3, "MBA": 3,
+    "PhD": 4,
+}
+
+def extract_experience_years(text: str) -> Optional[int]:
+    experience_match = EXPERIENCE_PATTERN.search(text.lower())
+    return int(experience_match.group(1)) if experience_match else None
+
+def extract_education_keyword(text: str) -> Optional[str]:
     text_lower = text.lower()
-    found_skills = []
-    for skill in TECH_SKILLS:
-        # Check for exact word match to avoid false positives
-        skill_lower = skill.lower()
-        if skill_lower in text_lower:
-            found_skills.append(skill)
-    return list(set(found_skills))  # Remove duplicates
+    for keyword in EDUCATION_KEYWORDS:
+        if keyword.lower() in text_lower:
+            return keyword
+    return None
 
 def extract_resume_info(text: str):
     """Extract skills, experience, and education from resume text"""
     skills = extract_skills(text)
     
     # Try to extract experience years
-    import re
-    experience_match = re.search(r'(\d+)\+?\s*years?\s*(of)?\s*(experience|working)?', text.lower())
-    experience = f"{experience_match.group(1)} years of experience" if experience_match else "Experience not specified"
+    years = extract_experience_years(text)
+    experience = f"{years} years of experience" if years is not None else "Experience not specified"
     
     # Try to extract education
-    education_keywords = ["Bachelor", "Master", "PhD", "B.S.", "M.S.", "B.A.", "M.A.", "MBA", "Degree"]
-    education = "Education not specified"
-    for keyword in education_keywords:
-        if keyword.lower() in text.lower():
-            education = f"{keyword} degree found"
-            break
+    keyword = extract_education_keyword(text)
+    education = f"{keyword} degree found" if keyword else "Education not specified"
     
     return skills, experience, education
 
@@ -85,18 +95,61 @@ def extract_job_description_info(text: str):
     skills = extract_skills(text)
     return skills
 
+def extract_job_description_features(text: str):
+    """Derived job description features, stored once at upload"""
+    keyword = extract_education_keyword(text)
+    return {
+        "skills": extract_job_description_info(text),
+        "min_experience_years": extract_experience_years(text),
+        "education_level": EDUCATION_LEVELS[keyword] if keyword else 0,
+    }
+
+def job_required_skills(job):
+    """Required skills stored on a JobDescription row"""
+    return (job.features or {}).get("skills", [])
+
+def parse_stored_skills(skills_str: Optional[str]):
+    """Split the comma-separated skills column stored on Resume rows"""
+    if not skills_str:
+        return []
+    return [skill.strip() for skill in skills_str.split(",") if skill.strip()]
+
 def compare_skills(resume_skills: list, job_skills: list):
+    job_skills = set(job_skills)
     matching_skills = [skill for skill in resume_skills if skill in job_skills]
     return matching_skills
 
 def match_resume_to_job(resume_text: str, job_description_text: str):
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform([resume_text, job_description_text])
-    similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-    return similarity[0][0]
-
-def calculate_match_score(skills_similarity, experience_similarity, education_similarity):
-    return 0.4 * skills_similarity + 0.3 * experience_similarity + 0.2 * education_similarity
+    """TF-IDF similarity weighted by the shared corpus IDF (see tfidf_index)"""
+    return text_similarity(resume_text, job_description_text)
+
+# Default weights for calculate_match_score; override with SCORE_WEIGHTS,
+# e.g. "skills=0.5,experience=0.2,education=0.2,text=0.1"
+DEFAULT_SCORE_WEIGHTS = {"skills": 0.4, "experience": 0.3, "education": 0.2, "text": 0.1}
+
+def parse_score_weights(spec: Optional[str]):
+    """Parse "name=weight,..." on top of the defaults"""
+    weights = dict(DEFAULT_SCORE_WEIGHTS)
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"Unknown score weight: {name}")
+        weights[name] = float(value)
+    return weights
+
+SCORE_WEIGHTS = parse_score_weights(os.getenv("SCORE_WEIGHTS"))
+
+def calculate_match_score(skills_similarity, experience_similarity, education_similarity,
+                          text_similarity=0.0, weights=None):
+    """Weighted sum of the similarities; works on scalars or NumPy arrays"""
+    weights = weights or SCORE_WEIGHTS
+    return (weights["skills"] * skills_similarity
+            + weights["experience"] * experience_similarity
+            + weights["education"] * education_similarity
+            + weights["text"] * text_similarity)
 #################################################
 # Authentication functions
 def verify_password(plain_password: str, hashed_password: str):
@@ -115,24 +168,41 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)  # Make sure this is included
-):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _token_data(token: str) -> TokenData:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        return TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)  # Shared with async endpoints of the same request
+):
+    token_data = _token_data(token)
+    user = await db.scalar(select(User).where(User.email == token_data.email))
+    # Give the connection back while the endpoint runs; user stays loaded
+    # (expire_on_commit=False) and attached for the endpoint's own queries
+    await db.commit()
+    if user is None:
+        raise credentials_exception
+    return user
+
+def get_current_user_sync(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)  # Shared with sync-session endpoints of the same request
+):
+    """get_current_user for endpoints on the sync session: one connection per request"""
+    token_data = _token_data(token)
     user = db.query(User).filter(User.email == token_data.email).first()
     if user is None:
         raise credentials_exception
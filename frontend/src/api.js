@@ -92,8 +92,35 @@ export const uploadJobDescription = (file) => {
   });
 };
 
-export const getJobDescriptions = () => {
-  return api.get("/job-descriptions/");
+// Uploads are processed in the background; poll until the document is ready,
+// giving up after timeoutMs (e.g. no ingest worker is running)
+export const waitForProcessing = async (processingId, intervalMs = 1000, timeoutMs = 5 * 60 * 1000) => {
+  const deadline = Date.now() + timeoutMs;
+  for (;;) {
+    if (Date.now() > deadline) {
+      throw new Error("Processing is taking too long; check back later");
+    }
+    const response = await api.get(`/processing/${processingId}`);
+    if (response.data.status === "done") {
+      return response.data.result;
+    }
+    if (response.data.status === "failed") {
+      throw new Error(response.data.error || "Processing failed");
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+};
+
+// List endpoints return one page at a time, newest first, with the cursor
+// for the next page in the X-Next-Cursor header (none on the last page).
+// Pass nextCursor back in to get the page after this one.
+export const getPage = async (url, cursor = null) => {
+  const response = await api.get(url, { params: { cursor } });
+  return { data: response.data, nextCursor: response.headers["x-next-cursor"] || null };
+};
+
+export const getJobDescriptions = (cursor = null) => {
+  return getPage("/job-descriptions/", cursor);
 };
 
 export const rankCandidates = (jobDescriptionId) => {
@@ -105,18 +132,18 @@ export const rankCandidates = (jobDescriptionId) => {
 };
 
 // Get user's resumes
-export const getMyResumes = () => {
-  return api.get("/resumes/me");
+export const getMyResumes = (cursor = null) => {
+  return getPage("/resumes/me", cursor);
 };
 
 // Get user's applications
-export const getMyApplications = () => {
-  return api.get("/applications");
+export const getMyApplications = (cursor = null) => {
+  return getPage("/applications", cursor);
 };
 
 // Get available jobs for applicants
-export const getAvailableJobs = () => {
-  return api.get("/jobs/available");
+export const getAvailableJobs = (cursor = null) => {
+  return getPage("/jobs/available", cursor);
 };
 
 // Session management
@@ -128,8 +155,8 @@ export const logoutCurrentSession = () => {
   return api.post("/logout-current");
 };
 
-export const getActiveSessions = () => {
-  return api.get("/sessions");
+export const getActiveSessions = (cursor = null) => {
+  return getPage("/sessions", cursor);
 };
 
 export const revokeSession = (sessionId) => {
@@ -137,12 +164,12 @@ export const revokeSession = (sessionId) => {
 };
 
 // Recruiter application management
-export const getRecruiterApplications = () => {
-  return api.get("/recruiter/applications");
+export const getRecruiterApplications = (cursor = null) => {
+  return getPage("/recruiter/applications", cursor);
 };
 
-export const getJobApplications = (jobId) => {
-  return api.get(`/recruiter/applications/${jobId}`);
+export const getJobApplications = (jobId, cursor = null) => {
+  return getPage(`/recruiter/applications/${jobId}`, cursor);
 };
 
 export const updateApplicationStatus = (applicationId, status) => {
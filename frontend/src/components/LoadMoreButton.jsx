@@ -0,0 +1,34 @@
+import React, { useState } from 'react';
+
+// Goes under a paged list; shown while the server has more pages
+const LoadMoreButton = ({ hasMore, onLoadMore }) => {
+  const [isLoading, setIsLoading] = useState(false);
+
+  if (!hasMore) {
+    return null;
+  }
+
+  const handleClick = async () => {
+    setIsLoading(true);
+    try {
+      await onLoadMore();
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  return (
+    <div className="flex justify-center mt-6">
+      <button
+        type="button"
+        onClick={handleClick}
+        disabled={isLoading}
+        className="px-5 py-2.5 text-sm font-medium text-blue-600 bg-blue-50 rounded-lg hover:bg-blue-100 transition-colors disabled:opacity-50"
+      >
+        {isLoading ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
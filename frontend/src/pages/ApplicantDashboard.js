@@ -1,6 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate, Link } from 'react-router-dom';
+import { getAvailableJobs, getMyApplications, getMyResumes, waitForProcessing } from '../api';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const ApplicantDashboard = () => {
   const [userProfile, setUserProfile] = useState({
@@ -11,6 +13,8 @@ const ApplicantDashboard = () => {
   const [resumes, setResumes] = useState([]);
   const [applications, setApplications] = useState([]);
   const [availableJobs, setAvailableJobs] = useState([]);
+  // Cursor of the next page of each list; null once it is fully loaded
+  const [nextCursors, setNextCursors] = useState({ resumes: null, applications: null, jobs: null });
   const [activeTab, setActiveTab] = useState('resumes');
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState('');
@@ -40,24 +44,22 @@ const ApplicantDashboard = () => {
           name: profileResponse.data.name || 'Applicant'
         });
 
-        // Fetch resumes
-        const resumesResponse = await axios.get('http://localhost:8000/resumes/me', {
-          headers: { Authorization: `Bearer ${token}` }
-        });
+        // Fetch the first page of resumes, applications and available jobs
+        const resumesResponse = await getMyResumes();
         setResumes(resumesResponse.data);
 
-        // Fetch applications
-        const applicationsResponse = await axios.get('http://localhost:8000/applications', {
-          headers: { Authorization: `Bearer ${token}` }
-        });
+        const applicationsResponse = await getMyApplications();
         setApplications(applicationsResponse.data);
 
-        // Fetch available jobs
-        const jobsResponse = await axios.get('http://localhost:8000/jobs/available', {
-          headers: { Authorization: `Bearer ${token}` }
-        });
+        const jobsResponse = await getAvailableJobs();
         setAvailableJobs(jobsResponse.data);
 
+        setNextCursors({
+          resumes: resumesResponse.nextCursor,
+          applications: applicationsResponse.nextCursor,
+          jobs: jobsResponse.nextCursor
+        });
+
       } catch (err) {
         setError(err.response?.data?.detail || 'Failed to load data');
       } finally {
@@ -68,6 +70,21 @@ const ApplicantDashboard = () => {
     fetchData();
   }, [navigate]);
 
+  // Append the next page of one list
+  const loadMore = async (list, getNextPage, setItems) => {
+    try {
+      const response = await getNextPage(nextCursors[list]);
+      setItems(prev => [...prev, ...response.data]);
+      setNextCursors(prev => ({ ...prev, [list]: response.nextCursor }));
+    } catch (err) {
+      setUploadStatus({
+        show: true,
+        success: false,
+        message: err.response?.data?.detail || 'Failed to load more'
+      });
+    }
+  };
+
   const handleLogout = () => {
     localStorage.removeItem('token');
     localStorage.removeItem('role');
@@ -89,11 +106,12 @@ const ApplicantDashboard = () => {
         }
       });
 
-      setResumes(prev => [...prev, response.data]);
+      const resume = await waitForProcessing(response.data.processing_id);
+      setResumes(prev => [...prev, resume]);
       setUploadStatus({ 
         show: true, 
         success: true, 
-        message: `Resume "${file.name}" uploaded successfully! Skills detected: ${response.data.skills?.join(', ') || 'None'}` 
+        message: `Resume "${file.name}" uploaded successfully! Skills detected: ${resume.skills?.join(', ') || 'None'}` 
       });
       
       // Auto-hide success message after 5 seconds
@@ -101,7 +119,7 @@ const ApplicantDashboard = () => {
       
       return { success: true };
     } catch (err) {
-      const errorMsg = err.response?.data?.detail || 'Failed to upload resume';
+      const errorMsg = err.response?.data?.detail || err.message || 'Failed to upload resume';
       setUploadStatus({ show: true, success: false, message: errorMsg });
       return { success: false, error: errorMsg };
     } finally {
@@ -307,7 +325,7 @@ const ApplicantDashboard = () => {
               </div>
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">My Resumes</p>
-                <p className="text-2xl font-bold text-gray-900">{resumes.length}</p>
+                <p className="text-2xl font-bold text-gray-900">{resumes.length}{nextCursors.resumes ? '+' : ''}</p>
               </div>
             </div>
           </div>
@@ -320,7 +338,7 @@ const ApplicantDashboard = () => {
               </div>
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Applications</p>
-                <p className="text-2xl font-bold text-gray-900">{applications.length}</p>
+                <p className="text-2xl font-bold text-gray-900">{applications.length}{nextCursors.applications ? '+' : ''}</p>
               </div>
             </div>
           </div>
@@ -333,7 +351,7 @@ const ApplicantDashboard = () => {
               </div>
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Available Jobs</p>
-                <p className="text-2xl font-bold text-gray-900">{availableJobs.length}</p>
+                <p className="text-2xl font-bold text-gray-900">{availableJobs.length}{nextCursors.jobs ? '+' : ''}</p>
               </div>
             </div>
           </div>
@@ -535,6 +553,10 @@ const ApplicantDashboard = () => {
                     ))}
                   </div>
                 )}
+                <LoadMoreButton
+                  hasMore={!!nextCursors.resumes}
+                  onLoadMore={() => loadMore('resumes', getMyResumes, setResumes)}
+                />
               </div>
             )}
 
@@ -615,6 +637,10 @@ const ApplicantDashboard = () => {
                     </table>
                   </div>
                 )}
+                <LoadMoreButton
+                  hasMore={!!nextCursors.applications}
+                  onLoadMore={() => loadMore('applications', getMyApplications, setApplications)}
+                />
               </div>
             )}
 
@@ -708,6 +734,10 @@ const ApplicantDashboard = () => {
                     ))}
                   </div>
                 )}
+                <LoadMoreButton
+                  hasMore={!!nextCursors.jobs}
+                  onLoadMore={() => loadMore('jobs', getAvailableJobs, setAvailableJobs)}
+                />
               </div>
             )}
           </div>
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
 import { getActiveSessions, revokeSession, logout } from '../api';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const ProfilePage = () => {
   const [userData, setUserData] = useState({
@@ -19,6 +20,7 @@ const ProfilePage = () => {
   const [isSaving, setIsSaving] = useState(false);
   const [showPasswordSection, setShowPasswordSection] = useState(false);
   const [sessions, setSessions] = useState([]);
+  const [nextSessionsCursor, setNextSessionsCursor] = useState(null);
   const [showSessions, setShowSessions] = useState(false);
   const navigate = useNavigate();
 
@@ -52,6 +54,17 @@ const ProfilePage = () => {
     try {
       const response = await getActiveSessions();
       setSessions(response.data);
+      setNextSessionsCursor(response.nextCursor);
+    } catch (error) {
+      console.error('Failed to fetch sessions:', error);
+    }
+  };
+
+  const loadMoreSessions = async () => {
+    try {
+      const response = await getActiveSessions(nextSessionsCursor);
+      setSessions(prev => [...prev, ...response.data]);
+      setNextSessionsCursor(response.nextCursor);
     } catch (error) {
       console.error('Failed to fetch sessions:', error);
     }
@@ -459,6 +472,7 @@ const ProfilePage = () => {
                     ))}
                   </div>
                 )}
+                <LoadMoreButton hasMore={!!nextSessionsCursor} onLoadMore={loadMoreSessions} />
               </div>
             )}
           </div>
@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate, Link } from 'react-router-dom';
-import { getRecruiterApplications, updateApplicationStatus } from '../api';
+import { getJobDescriptions, getRecruiterApplications, updateApplicationStatus, waitForProcessing } from '../api';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const RecruiterDashboard = () => {
     const [userProfile, setUserProfile] = useState({
@@ -13,6 +14,8 @@ const RecruiterDashboard = () => {
     const [jobPostings, setJobPostings] = useState([]);
     const [candidates, setCandidates] = useState([]);
     const [applications, setApplications] = useState([]);
+    // Cursor of the next page of each list; null once it is fully loaded
+    const [nextCursors, setNextCursors] = useState({ jobs: null, applications: null });
     const [stats, setStats] = useState({ total_candidates: 0, active_jobs: 0, total_applications: 0 });
     const [newJobTitle, setNewJobTitle] = useState('');
     const [selectedFile, setSelectedFile] = useState(null);
@@ -28,11 +31,24 @@ const RecruiterDashboard = () => {
         try {
             const res = await getRecruiterApplications();
             setApplications(res.data);
+            setNextCursors(prev => ({ ...prev, applications: res.nextCursor }));
         } catch (err) {
             console.error('Failed to fetch applications:', err);
         }
     };
 
+    // Append the next page of one list
+    const loadMore = async (list, getNextPage, setItems) => {
+        try {
+            const res = await getNextPage(nextCursors[list]);
+            setItems(prev => [...prev, ...res.data]);
+            setNextCursors(prev => ({ ...prev, [list]: res.nextCursor }));
+        } catch (err) {
+            setError(err.response?.data?.detail || 'Failed to load more');
+            setTimeout(() => setError(''), 3000);
+        }
+    };
+
     const handleUpdateStatus = async (applicationId, newStatus) => {
         try {
             await updateApplicationStatus(applicationId, newStatus);
@@ -61,10 +77,9 @@ const RecruiterDashboard = () => {
 
     const fetchJobPostings = async () => {
         try {
-            const res = await axios.get('http://localhost:8000/job-descriptions/', {
-                headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
-            });
+            const res = await getJobDescriptions();
             setJobPostings(res.data);
+            setNextCursors(prev => ({ ...prev, jobs: res.nextCursor }));
             setIsLoading(false);
         } catch (err) {
             setError('Failed to fetch job postings');
@@ -136,7 +151,7 @@ const RecruiterDashboard = () => {
             formData.append('file', selectedFile);
             formData.append('title', newJobTitle);
 
-            await axios.post('http://localhost:8000/upload-job-description/', formData, {
+            const response = await axios.post('http://localhost:8000/upload-job-description/', formData, {
                 headers: { 
                     Authorization: `Bearer ${localStorage.getItem('token')}`,
                     'Content-Type': 'multipart/form-data'
@@ -148,6 +163,7 @@ const RecruiterDashboard = () => {
                     setUploadProgress(percentCompleted);
                 }
             });
+            await waitForProcessing(response.data.processing_id);
 
             setSuccessMessage('Job description uploaded successfully!');
             setNewJobTitle('');
@@ -157,7 +173,7 @@ const RecruiterDashboard = () => {
             
             setTimeout(() => setSuccessMessage(''), 3000);
         } catch (err) {
-            setError(err.response?.data?.detail || 'Failed to upload job description');
+            setError(err.response?.data?.detail || err.message || 'Failed to upload job description');
         } finally {
             setIsUploading(false);
         }
@@ -321,7 +337,7 @@ const RecruiterDashboard = () => {
                             </div>
                             <div className="ml-4">
                                 <p className="text-sm text-gray-500">Active Jobs</p>
-                                <p className="text-2xl font-bold text-gray-900">{jobPostings.length}</p>
+                                <p className="text-2xl font-bold text-gray-900">{jobPostings.length}{nextCursors.jobs ? '+' : ''}</p>
                             </div>
                         </div>
                     </div>
@@ -376,7 +392,7 @@ const RecruiterDashboard = () => {
                                 Applications
                                 {applications.length > 0 && (
                                     <span className="ml-2 bg-green-100 text-green-700 text-xs px-2 py-0.5 rounded-full">
-                                        {applications.length}
+                                        {applications.length}{nextCursors.applications ? '+' : ''}
                                     </span>
                                 )}
                             </button>
@@ -596,6 +612,10 @@ const RecruiterDashboard = () => {
                                             ))}
                                         </div>
                                     )}
+                                    <LoadMoreButton
+                                        hasMore={!!nextCursors.jobs}
+                                        onLoadMore={() => loadMore('jobs', getJobDescriptions, setJobPostings)}
+                                    />
                                 </div>
                             </div>
                         ) : activeTab === 'applications' ? (
@@ -683,6 +703,10 @@ const RecruiterDashboard = () => {
                                         ))}
                                     </div>
                                 )}
+                                <LoadMoreButton
+                                    hasMore={!!nextCursors.applications}
+                                    onLoadMore={() => loadMore('applications', getRecruiterApplications, setApplications)}
+                                />
                             </div>
                         ) : (
                             <div>